@@ -2,17 +2,29 @@
 from .asyncsleepiq import AsyncSleepIQ
 from .actuator import SleepIQActuator
 from .bed import SleepIQBed
+from .cache import ResponseCache
+from .capabilities import CapabilityCache
 from .consts import *
+from .credentials import CredentialStore, Credentials, FileCredentialStore
 from .core_climate import SleepIQCoreClimate
+from .debounce import CoalescingWriter
+from .events import ChangeEvent, EventBus, EventSubscription
 from .exceptions import (
     SleepIQAPIException,
+    SleepIQCircuitOpenException,
     SleepIQLoginException,
     SleepIQTimeoutException,
 )
 from .foot_warmer import SleepIQFootWarmer
 from .foundation import SleepIQFoundation
+from .instrumentation import Instrumentation, LatencyHistogram, RequestRecord
 from .light import SleepIQLight
 from .preset import SleepIQPreset
+from .rate_limit import RateLimiter, TokenBucket
+from .retry import CircuitBreaker, RetryPolicy
+from .scheduler import PollingPolicy, PollingScheduler
+from .session import ConnectionOptions, create_client_session, create_connector
+from .sleep_store import SleepDataStore, SQLiteSleepDataStore
 from .sleeper import SleepIQSleeper, SleepData
 
 __version__ = "{{VERSION_PLACEHOLDER}}"
@@ -1,10 +1,12 @@
 """Actuator representation for SleepIQ API."""
 from __future__ import annotations
 
+import time
 from typing import Any
 
 from .api import SleepIQAPI
 from .consts import ACTUATORS_FULL, SIDES_FULL, SIDES_SHORT, End, Side
+from .debounce import CoalescingWriter
 
 
 class SleepIQActuator:
@@ -21,6 +23,10 @@ class SleepIQActuator:
         self.actuator = actuator
         self.actuator_full = ACTUATORS_FULL[actuator]
         self.position = 0
+        # last position sent until it's reached, with the time.monotonic() it was sent
+        self.target: int | None = None
+        self.target_time = 0.0
+        self._position_writer = CoalescingWriter(self._send_position)
 
     def __str__(self) -> str:
         """Return string representation."""
@@ -30,10 +36,30 @@ class SleepIQActuator:
         """Return string representation."""
         return f"SleepIQActuator[{self.actuator_full} {self.side}], position={self.position}"
 
+    @property
+    def debounce_window(self) -> float:
+        """Seconds set_position calls are coalesced over, 0 sends every call."""
+        return self._position_writer.window
+
+    @debounce_window.setter
+    def debounce_window(self, window: float) -> None:
+        self._position_writer.window = window
+
     async def set_position(self, position: int, slow_speed: bool = False) -> None:
-        """Set the position of an actuator through the API."""
+        """Set the position of an actuator through the API.
+
+        With a debounce_window only the latest position of a burst of calls
+        is sent, and each call returns once that command is acknowledged.
+        """
         if position < 0 or position > 100:
             raise ValueError("Invalid position, must be between 0 and 100")
+        if self.debounce_window > 0:
+            await self._position_writer.write(position, slow_speed)
+        else:
+            await self._send_position(position, slow_speed)
+
+    async def _send_position(self, position: int, slow_speed: bool) -> None:
+        """Send a target position to the API."""
         if position == self.position:
             return
         data = {
@@ -43,9 +69,17 @@ class SleepIQActuator:
             "speed": 1 if slow_speed else 0,
         }
         await self._api.put(f"bed/{self.bed_id}/foundation/adjustment/micro", data)
+        self._set_target(position)
+
+    def _set_target(self, position: int) -> None:
+        """Record a position sent to the API as the target."""
+        self.target = position
+        self.target_time = time.monotonic()
 
     async def update(self, data: dict[str, Any]) -> None:
         """Update the position of an actuator from the API."""
         # The API reports position in hex, but is set with an integer.
         # We'll always show position with an integer value.
         self.position = int(data[f"fs{self.side_full}{self.actuator_full}Position"], 16)
+        if self.position == self.target:
+            self.target = None
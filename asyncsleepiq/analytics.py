@@ -0,0 +1,163 @@
+"""Columnar sleep history analytics, requires numpy (pip install asyncsleepiq[analytics])."""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable
+from datetime import date
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+from .sleeper import SleepData, SleepIQSleeper, _primary_session
+
+# SleepData fields held as columns and the session keys they're read from
+SESSION_FIELDS = {
+    "duration": "inBed",
+    "sleep_score": "sleepQuotient",
+    "heart_rate": "avgHeartRate",
+    "respiratory_rate": "avgRespirationRate",
+    "hrv": "hrv",
+    "restful": "restful",
+    "restless": "restless",
+    "out_of_bed": "outOfBed",
+    "fall_asleep_period": "fallAsleepPeriod",
+}
+FIELDS = ("session_count", *SESSION_FIELDS)
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("numpy is required for sleep analytics, install asyncsleepiq[analytics]")
+
+
+class _Columns:
+    """Growable float columns, NaN for missing values."""
+
+    def __init__(self) -> None:
+        self.dates: list[str] = []
+        self.values = {field: array("d") for field in FIELDS}
+
+    def add(self, night: str, values: dict[str, Any]) -> None:
+        self.dates.append(night)
+        for field, column in self.values.items():
+            value = values.get(field)
+            column.append(float("nan") if value is None else value)
+
+    def add_day(self, day: dict[str, Any]) -> None:
+        """Add a raw sleepData day entry, skipping days without sessions."""
+        session = _primary_session(day.get("sessions", []))
+        if session is not None:
+            values = {field: session.get(key) for field, key in SESSION_FIELDS.items()}
+            values["session_count"] = len(day["sessions"])
+            self.add(day["date"][:10], values)
+
+
+class SleepHistory:
+    """Nights of a sleeper's sleep data as numpy columns.
+
+    dates is a datetime64[D] array and every field of FIELDS is a float
+    masked array of the same length, masked where the API had no value.
+    Rolling windows count nights with data, not calendar days.
+    """
+
+    def __init__(self, dates: Any, columns: dict[str, Any]) -> None:
+        """Initialize sleep history."""
+        _require_numpy()
+        self.dates = dates
+        self.columns = columns
+
+    def __str__(self) -> str:
+        """Return string representation."""
+        if not len(self):
+            return "SleepHistory(nights=0)"
+        return f"SleepHistory(nights={len(self)}, {self.dates[0]}..{self.dates[-1]})"
+
+    __repr__ = __str__
+
+    def __len__(self) -> int:
+        """Return number of nights."""
+        return len(self.dates)
+
+    def __getitem__(self, field: str) -> Any:
+        """Return the masked array of a field."""
+        return self.columns[field]
+
+    @classmethod
+    def _from_columns(cls, columns: _Columns) -> SleepHistory:
+        _require_numpy()
+        arrays = {}
+        for field, column in columns.values.items():
+            arrays[field] = np.ma.masked_invalid(np.array(column, dtype=np.float64))
+        # the API reports these as 0 or negative when not measured
+        arrays["heart_rate"] = np.ma.masked_less_equal(arrays["heart_rate"], 0)
+        arrays["fall_asleep_period"] = np.ma.masked_less(arrays["fall_asleep_period"], 0)
+        return cls(np.array(columns.dates, dtype="datetime64[D]"), arrays)
+
+    @classmethod
+    def from_days(cls, days: Iterable[dict[str, Any]]) -> SleepHistory:
+        """Build from raw sleepData day entries, skipping days without sessions."""
+        columns = _Columns()
+        for day in days:
+            columns.add_day(day)
+        return cls._from_columns(columns)
+
+    @classmethod
+    def from_responses(cls, responses: Iterable[dict[str, Any]]) -> SleepHistory:
+        """Build from sleepData API responses, nights must not repeat."""
+        return cls.from_days(day for data in responses for day in data.get("sleepData", []))
+
+    @classmethod
+    def from_sleep_data(cls, nights: Iterable[SleepData]) -> SleepHistory:
+        """Build from SleepData objects that have a date."""
+        columns = _Columns()
+        for night in nights:
+            if night.date:
+                columns.add(night.date, {field: getattr(night, field) for field in FIELDS})
+        return cls._from_columns(columns)
+
+    @classmethod
+    async def fetch(cls, sleeper: SleepIQSleeper, start: date, end: date) -> SleepHistory:
+        """Fetch a sleeper's nights from start to end (inclusive) straight into columns.
+
+        Each night is added to the columns as it arrives, so the raw days
+        of the range are never held in memory together.
+        """
+        _require_numpy()
+        columns = _Columns()
+        async for day in sleeper.iter_sleep_days(start, end):
+            columns.add_day(day)
+        return cls._from_columns(columns)
+
+    def rolling_mean(self, field: str, window: int) -> Any:
+        """Return the mean of field over each night and the window - 1 nights before it.
+
+        Missing values are left out of each mean, which is masked if the
+        whole window is missing.
+        """
+        values = self.columns[field]
+        valid = (~np.ma.getmaskarray(values)).astype(np.float64)
+        sums = np.concatenate(([0.0], np.cumsum(values.filled(0.0))))
+        counts = np.concatenate(([0.0], np.cumsum(valid)))
+        lower = np.maximum(np.arange(1, len(values) + 1) - window, 0)
+        window_sums = sums[1:] - sums[lower]
+        window_counts = counts[1:] - counts[lower]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = window_sums / window_counts
+        return np.ma.masked_where(window_counts == 0, means)
+
+    def percentile(self, field: str, q: Any) -> Any:
+        """Return the q-th percentile(s) of field's values, nan if it has none."""
+        values = self.columns[field].compressed()
+        if not len(values):
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else float("nan")
+        return np.percentile(values, q)
+
+    def deltas(self, field: str) -> Any:
+        """Return the change of field from the previous night, masked where either is missing."""
+        values = self.columns[field]
+        if not len(values):
+            return values
+        return np.ma.concatenate([np.ma.masked_all(1), values[1:] - values[:-1]])
@@ -3,23 +3,42 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Callable
+from collections import Counter
+import copy
+from collections.abc import AsyncIterator, Awaitable, Callable
 from contextlib import AbstractAsyncContextManager
 import random
-from typing import Any, cast
+import time
+from typing import TYPE_CHECKING, Any, TypeVar, cast
 
-from aiohttp import ClientResponse, ClientSession, ClientTimeout
+from aiohttp import ClientConnectionError, ClientResponse, ClientSession, ClientTimeout
+from yarl import URL
 
-from .consts import API_URL, BAMKEY, LOGIN_KEY, TIMEOUT
+from .cache import ResponseCache
+from .capabilities import CapabilityCache
+from .consts import API_URL, BAMKEY, LOGIN_KEY, MIN_KEY_LIFETIME, TIMEOUT
+from .credentials import CredentialStore, Credentials
+from .decoder import JSONLoads, default_json_loads
+from .events import OVERFLOW_COALESCE, ChangeEvent, EventBus
+from .instrumentation import Instrumentation, RequestRecord
 from .exceptions import (
     SleepIQAPIException,
+    SleepIQCircuitOpenException,
     SleepIQLoginException,
     SleepIQTimeoutException,
 )
+from .rate_limit import RateLimiter
+from .retry import CircuitBreaker, RetryPolicy
+from .session import ConnectionOptions, create_client_session
+
+if TYPE_CHECKING:
+    from .sleep_store import SleepDataStore
 
 
 SOURCE_APP = "AsyncSleepIQ API"
 
+_T = TypeVar("_T")
+
 
 def random_user_agent() -> str:
     """Create a randomly generated sorta valid User Agent string."""
@@ -40,6 +59,47 @@ def random_user_agent() -> str:
     return template.format(os=random.choice(list(os.values())), ua=random.choice(list(uas.values())))
 
 
+async def gather_limited(limit: int, *aws: Awaitable[_T]) -> list[_T]:
+    """Await all awaitables with at most limit running at once, results in order.
+
+    If any awaitable raises, the remaining ones are cancelled and the
+    exception is propagated.
+    """
+    semaphore = asyncio.Semaphore(max(limit, 1))
+
+    async def run(aw: Awaitable[_T]) -> _T:
+        async with semaphore:
+            return await aw
+
+    tasks = [asyncio.ensure_future(run(aw)) for aw in aws]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+def endpoint_template(url: str) -> str:
+    """Return url with bed, sleeper and account ids replaced by {id}."""
+    parts = url.split("/")
+    for i in range(1, len(parts) - 1):
+        if parts[i - 1] in ("bed", "beds", "sleeper", "accounts"):
+            parts[i] = "{id}"
+    return "/".join(parts)
+
+
+def _scope(url: str) -> str:
+    """Return the cache scope of url, "bed/{bed_id}" for per bed endpoints."""
+    parts = url.split("/")
+    return "/".join(parts[:2]) if len(parts) > 2 else parts[0]
+
+
+def _freeze(params: dict[str, Any]) -> tuple[tuple[str, str], ...]:
+    """Return a hashable form of request params, ignoring the session key."""
+    return tuple(sorted((k, str(v)) for k, v in params.items() if k != "_k"))
+
+
 class SleepIQAPI:
     """API interface base class."""
 
@@ -49,12 +109,27 @@ class SleepIQAPI:
         password: str | None = None,
         login_method: int = LOGIN_KEY,
         client_session: ClientSession | None = None,
+        cache: ResponseCache | None = None,
+        credential_store: CredentialStore | None = None,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+        connection_options: ConnectionOptions | None = None,
+        api_url: str = API_URL,
+        sleep_store: SleepDataStore | None = None,
+        capability_cache: CapabilityCache | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
     ) -> None:
         """Initialize AsyncSleepIQ API Interface."""
+        self.api_url = api_url
         self.email = email
         self.password = password
         self.key = ""
-        self._session = client_session or ClientSession()
+        if client_session:
+            self._session = client_session
+        elif connection_options:
+            self._session = create_client_session(connection_options)
+        else:
+            self._session = ClientSession()
         self._headers = {
             "User-Agent": random_user_agent(),
             # Accept-Version required for HRV and other advanced sleep metrics
@@ -63,6 +138,54 @@ class SleepIQAPI:
         }
         self._login_method = login_method
         self._account_id = ""
+        # share identical concurrent reads between callers
+        self.single_flight = True
+        # shared requests by read key, with the scope a write drops them from
+        self._in_flight: dict[tuple[Any, ...], tuple[str, asyncio.Future[Any]]] = {}
+        # optional cache for rarely changing reads
+        self.cache = cache
+        # re-authentication is serialized, requests that failed with an older
+        # key generation reuse the key from a login that already happened
+        self._login_lock = asyncio.Lock()
+        self._key_generation = 0
+        self._login_time: float | None = None
+        # seconds a key stays valid, the longest observed before a 401
+        self.key_lifetime: float | None = None
+        # seconds before key_lifetime ends to log in again, None to disable
+        self.refresh_margin: float | None = None
+        # optional storage to reuse authentication across process restarts
+        self.credential_store = credential_store
+        # optional retries of idempotent reads and a circuit breaker for the
+        # API host, which can be shared between clients
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        # how often retries, timeouts, server errors, relogins and open circuits happen
+        self.request_stats: Counter[str] = Counter()
+        # optional pacing of requests, can be shared between clients
+        self.rate_limiter = rate_limiter
+        # per request records, latency histograms and sinks
+        self.instrumentation = Instrumentation()
+        # state changes found by status refreshes
+        self.event_bus = EventBus()
+        # optional local copy of sleep data, read before asking the API
+        self.sleep_store = sleep_store
+        # optional cache of foundation capabilities, skips presence queries at startup
+        self.capability_cache = capability_cache
+        # decoder of response bodies, orjson or msgspec when installed
+        self.json_loads: JSONLoads = default_json_loads()
+
+    async def events(self, maxsize: int = 1000, overflow: str = OVERFLOW_COALESCE) -> AsyncIterator[ChangeEvent]:
+        """Yield every field change found by fetch_bed_statuses and update_foundation_status.
+
+        Events are queued for this iterator from its first iteration on, see
+        EventSubscription for maxsize and overflow.
+        """
+        subscription = self.event_bus.subscribe(maxsize, overflow)
+        try:
+            while True:
+                yield await subscription.get()
+        finally:
+            self.event_bus.unsubscribe(subscription)
 
     async def close_session(self) -> None:
         """Close the API session."""
@@ -78,6 +201,16 @@ class SleepIQAPI:
         if not email or not password:
             raise SleepIQLoginException("username/password not set")
 
+        # reuse stored authentication on the first login, if it's rejected
+        # the relogin after the failed request does a full login
+        if self._key_generation == 0 and await self.__restore_credentials(email):
+            self.email = email
+            self.password = password
+            return
+
+        if self.rate_limiter:
+            await self.rate_limiter.acquire(write=True)
+
         try:
             if self._login_method == LOGIN_KEY:
                 await self.login_key(email, password)
@@ -95,6 +228,44 @@ class SleepIQAPI:
         # store in case we need to login again
         self.email = email
         self.password = password
+        self._key_generation += 1
+        self._login_time = time.monotonic()
+        await self.save_credentials()
+
+    async def save_credentials(self) -> None:
+        """Save the current authentication state to the credential store."""
+        if self.credential_store is None or not self.email:
+            return
+        cookies = self._session.cookie_jar.filter_cookies(URL(self.api_url))
+        age = time.monotonic() - self._login_time if self._login_time is not None else 0.0
+        credentials = Credentials(
+            login_method=self._login_method,
+            key=self.key,
+            authorization=self._headers.get("Authorization", ""),
+            cookies={name: morsel.value for name, morsel in cookies.items()},
+            account_id=self._account_id,
+            obtained_at=time.time() - age,
+        )
+        await self.credential_store.save(self.email, credentials)
+
+    async def __restore_credentials(self, email: str) -> bool:
+        """Apply stored authentication state for email, return true if there was any."""
+        if self.credential_store is None:
+            return False
+        credentials = await self.credential_store.load(email)
+        if credentials is None or credentials.login_method != self._login_method:
+            return False
+
+        self.key = credentials.key
+        if credentials.authorization:
+            self._headers["Authorization"] = credentials.authorization
+        if credentials.cookies:
+            self._session.cookie_jar.update_cookies(credentials.cookies, URL(self.api_url))
+        if credentials.account_id:
+            self._account_id = credentials.account_id
+        self._key_generation += 1
+        self._login_time = time.monotonic() - max(time.time() - credentials.obtained_at, 0)
+        return True
 
     async def login_key(self, email: str, password: str) -> None:
         """Login using the key authentication method with the email/password provided."""
@@ -102,7 +273,7 @@ class SleepIQAPI:
         auth_data = {"login": email, "password": password}
 
         async with self._session.put(
-            API_URL + "/login", headers=self._headers, timeout=TIMEOUT, json=auth_data
+            self.api_url + "/login", headers=self._headers, timeout=TIMEOUT, json=auth_data
         ) as resp:
             if resp.status == 401:
                 raise SleepIQLoginException("Incorrect username or password")
@@ -112,11 +283,11 @@ class SleepIQAPI:
                 raise SleepIQLoginException(
                     "Unexpected response code: {code}\n{body}".format(
                         code=resp.status,
-                        body=resp.text,
+                        body=await resp.text(),
                     )
                 )
 
-            json = await resp.json()
+            json = self.json_loads(await resp.read())
             self.key = json["key"]
 
     async def login_cookie(self, email: str, password: str) -> None:
@@ -140,35 +311,71 @@ class SleepIQAPI:
                 raise SleepIQLoginException(
                     "Unexpected response code: {code}\n{body}".format(
                         code=resp.status,
-                        body=resp.text,
+                        body=await resp.text(),
                     )
                 )
-            json = await resp.json()
+            json = self.json_loads(await resp.read())
             token = json["data"]["AccessToken"]
             self._headers["Authorization"] = token
 
-        async with self._session.get(API_URL + "/user/jwt", headers=self._headers, timeout=TIMEOUT) as resp:
+        async with self._session.get(self.api_url + "/user/jwt", headers=self._headers, timeout=TIMEOUT) as resp:
             if resp.status not in (200, 201):
                 raise SleepIQLoginException(
                     "Unexpected response code: {code}\n{body}".format(
                         code=resp.status,
-                        body=resp.text,
+                        body=await resp.text(),
                     )
                 )
 
     async def put(self, url: str, json: dict[str, Any] = {}, params: dict[str, Any] = {}) -> dict[str, Any]:
         """Make a PUT request to the API."""
-        return await self.__make_request(self._session.put, url, json, params)
+        try:
+            return await self.__make_request(self._session.put, url, json, params)
+        finally:
+            self.__invalidate(_scope(url))
 
     async def get(self, url: str, json: dict[str, Any] = {}, params: dict[str, Any] = {}) -> dict[str, Any] | Any:
         """Make a GET request to the API."""
-        return await self.__make_request(self._session.get, url, json, params)
+        key = ("GET", self.email, url, _freeze(params))
+        return await self.__cached_read(
+            key,
+            endpoint_template(url),
+            _scope(url),
+            lambda: self.__single_flight(
+                key, _scope(url), lambda: self.__make_request(self._session.get, url, json, params, idempotent=True)
+            ),
+        )
 
     async def check(self, url: str, json: dict[str, Any] = {}, params: dict[str, Any] = {}) -> bool:
         """Check if a GET request to the API would be successful."""
         return cast(
             bool,
-            await self.__make_request(self._session.get, url, json, params, check=True),
+            await self.__make_request(self._session.get, url, json, params, check=True, idempotent=True),
+        )
+
+    async def read(
+        self, url: str, reader: Callable[[ClientResponse], Awaitable[_T]], params: dict[str, Any] = {}
+    ) -> _T:
+        """Make a GET request to the API and return what reader makes of the successful response.
+
+        reader gets the response before its body is read, so large bodies
+        can be parsed as they stream in. The result isn't cached or shared
+        and reader is called again if the request is retried.
+        """
+        return cast(
+            _T,
+            await self.__make_request(self._session.get, url, {}, params, idempotent=True, reader=reader),
+        )
+
+    async def probe(self, url: str, json: dict[str, Any] = {}, params: dict[str, Any] = {}) -> tuple[int, Any]:
+        """Make a GET request to the API and return the status with the body if it was successful.
+
+        Unlike get, an error status is returned instead of raised, so one request
+        can both check if something exists and fetch it.
+        """
+        return cast(
+            "tuple[int, Any]",
+            await self.__make_request(self._session.get, url, json, params, probe=True, idempotent=True),
         )
 
     async def bamkey(self, bed_id: str, key: str, args: list[str] = []) -> str:
@@ -179,10 +386,165 @@ class SleepIQAPI:
             "key": BAMKEY[key],
             "sourceApplication": SOURCE_APP,
         }
-        json = await self.put(url, json)
-        return json.get("cdcResponse", "").replace("PASS:", "")
+        scope = f"bed/{bed_id}"
+        if not key.startswith("Get"):
+            try:
+                response = await self.__make_request(self._session.put, url, json, command=key)
+            finally:
+                self.__invalidate(scope)
+            return response.get("cdcResponse", "").replace("PASS:", "")
+
+        request_key = ("bamkey", self.email, bed_id, key, tuple(args))
+
+        async def read() -> str:
+            response = await self.__single_flight(
+                request_key, scope, lambda: self.__make_request(self._session.put, url, json, idempotent=True, command=key)
+            )
+            return response.get("cdcResponse", "").replace("PASS:", "")
+
+        return await self.__cached_read(request_key, key, scope, read)
+
+    async def __cached_read(
+        self, key: tuple[Any, ...], endpoint: str, scope: str, request: Callable[[], Awaitable[_T]]
+    ) -> _T:
+        """Return a cached response for a read or make the request and cache it.
+
+        Callers get their own copy, so changing a response doesn't change
+        the cached one.
+        """
+        ttl = self.cache.ttl(endpoint) if self.cache is not None else None
+        if self.cache is None or ttl is None:
+            return await request()
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cast(_T, copy.deepcopy(cached))
+        generation = self.cache.generation(scope)
+        response = await request()
+        self.cache.set(key, scope, copy.deepcopy(response), ttl, generation)
+        return response
+
+    def __invalidate(self, scope: str) -> None:
+        """Invalidate cached and in-flight reads a write to scope may have changed.
+
+        Reads made after the write start a new request instead of sharing
+        one that may have been answered before the write.
+        """
+        scopes = {scope, scope.split("/")[0]}
+        for key in [key for key, (read_scope, _) in self._in_flight.items() if read_scope in scopes]:
+            del self._in_flight[key]
+        if self.cache is None:
+            return
+        for scope in scopes:
+            self.cache.invalidate(scope)
+
+    async def __single_flight(self, key: tuple[Any, ...], scope: str, request: Callable[[], Awaitable[_T]]) -> _T:
+        """Share one in-flight request between concurrent callers making the same read."""
+        if not self.single_flight:
+            return await request()
+
+        task = self._in_flight.get(key, (scope, None))[1]
+        if task is None:
+            task = asyncio.ensure_future(request())
+            self._in_flight[key] = (scope, task)
+            task.add_done_callback(lambda done: self.__request_done(key, done))
+        # a caller being cancelled must not cancel the request for the others
+        return cast(_T, await asyncio.shield(task))
+
+    def __request_done(self, key: tuple[Any, ...], task: asyncio.Future[Any]) -> None:
+        """Forget a finished shared request."""
+        if key in self._in_flight and self._in_flight[key][1] is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # mark the exception as retrieved in case every caller was cancelled
+            task.exception()
 
     async def __make_request(
+        self,
+        make_request: Callable[..., AbstractAsyncContextManager[ClientResponse]],
+        url: str,
+        json: dict[str, Any] = {},
+        params: dict[str, Any] = {},
+        check: bool = False,
+        idempotent: bool = False,
+        command: str | None = None,
+        probe: bool = False,
+        reader: Callable[[ClientResponse], Awaitable[Any]] | None = None,
+    ) -> bool | dict[str, Any] | Any:
+        """Make a request to the API, retrying idempotent requests per the retry policy."""
+        record = RequestRecord(make_request.__name__.upper(), endpoint_template(url), command)
+        start = time.monotonic()
+        try:
+            return await self.__retry_request(
+                make_request, url, json, params, check, probe, idempotent, record, reader
+            )
+        except BaseException as ex:
+            record.error = type(ex).__name__
+            raise
+        finally:
+            record.duration = time.monotonic() - start
+            self.instrumentation.record(record)
+
+    async def __retry_request(
+        self,
+        make_request: Callable[..., AbstractAsyncContextManager[ClientResponse]],
+        url: str,
+        json: dict[str, Any],
+        params: dict[str, Any],
+        check: bool,
+        probe: bool,
+        idempotent: bool,
+        record: RequestRecord,
+        reader: Callable[[ClientResponse], Awaitable[Any]] | None = None,
+    ) -> bool | dict[str, Any] | Any:
+        """Make a request, retrying failed idempotent requests per the retry policy."""
+        policy = self.retry_policy
+        breaker = self.__breaker()
+        start = time.monotonic()
+        attempt = 1
+        while True:
+            if breaker and not breaker.allow():
+                self.request_stats["circuit_open"] += 1
+                raise SleepIQCircuitOpenException(URL(self.api_url).host)
+            try:
+                result = await self.__send_request(
+                    make_request,
+                    url,
+                    json,
+                    params,
+                    check=check,
+                    probe=probe,
+                    write=not idempotent,
+                    record=record,
+                    reader=reader,
+                )
+            except (SleepIQTimeoutException, SleepIQAPIException, ClientConnectionError) as ex:
+                failed = not isinstance(ex, SleepIQAPIException) or bool(policy and ex.code in policy.retry_statuses)
+                if breaker and failed:
+                    breaker.record_failure()
+                elif breaker:
+                    breaker.record_success()
+                if not policy or not idempotent or not failed or attempt >= policy.max_attempts:
+                    raise
+                delay = policy.delay(attempt)
+                if time.monotonic() - start + delay > policy.max_elapsed:
+                    raise
+                self.request_stats["retries"] += 1
+                record.retries += 1
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            if breaker:
+                breaker.record_success()
+            return result
+
+    def __breaker(self) -> CircuitBreaker | None:
+        """Return the circuit breaker for the API host, None if disabled."""
+        if self.circuit_breaker is None and self.retry_policy and self.retry_policy.breaker_threshold:
+            self.circuit_breaker = CircuitBreaker(self.retry_policy.breaker_threshold, self.retry_policy.breaker_reset)
+        return self.circuit_breaker
+
+    async def __send_request(
         self,
         make_request: Callable[..., AbstractAsyncContextManager[ClientResponse]],
         url: str,
@@ -190,28 +552,92 @@ class SleepIQAPI:
         params: dict[str, Any] = {},
         retry: bool = True,
         check: bool = False,
+        probe: bool = False,
+        write: bool = True,
+        record: RequestRecord | None = None,
+        reader: Callable[[ClientResponse], Awaitable[Any]] | None = None,
     ) -> bool | dict[str, Any] | Any:
-        """Make a request to the API."""
-        timeout = ClientTimeout(total=TIMEOUT)
-        params["_k"] = self.key
+        """Make a single request to the API, logging in again if the key expired."""
+        # a streamed body may take longer than TIMEOUT, as long as it keeps arriving
+        timeout = ClientTimeout(sock_read=TIMEOUT) if reader else ClientTimeout(total=TIMEOUT)
+        if self.__key_expiring():
+            await self.__relogin(self._key_generation)
+        if self.rate_limiter:
+            await self.rate_limiter.acquire(write)
+        generation = self._key_generation
         try:
             async with make_request(
-                API_URL + "/" + url,
+                self.api_url + "/" + url,
                 headers=self._headers,
                 timeout=timeout,
                 json=json,
-                params=params,
+                params={**params, "_k": self.key},
             ) as resp:
+                if record:
+                    record.status = resp.status
                 if check:
                     return resp.status == 200
 
-                if resp.status != 200:
-                    if retry and resp.status in (401, 404):
-                        # login and try again
-                        await self.login()
-                        return await self.__make_request(make_request, url, json, params, False)
-                    raise SleepIQAPIException(resp.status, f"API call error response {resp.status}\n{resp.text}")
-                return await resp.json()
+                if resp.status == 200 and reader:
+                    result = await reader(resp)
+                    if record:
+                        record.bytes = resp.content.total_bytes
+                    return result
+                if resp.status == 200:
+                    self.__observe_key_age(False, generation)
+                    body = await resp.read()
+                    if record:
+                        record.bytes = len(body)
+                    json = self.json_loads(body) if body.strip() else None
+                    return (resp.status, json) if probe else json
+                if probe and (resp.status != 401 or not retry):
+                    # only an expired key is worth a relogin, other errors are the answer
+                    return resp.status, None
+                if resp.status >= 500:
+                    self.request_stats["server_errors"] += 1
+                if not retry or resp.status not in (401, 404):
+                    raise SleepIQAPIException(resp.status, f"API call error response {resp.status}\n{await resp.text()}")
+                if resp.status == 401:
+                    self.__observe_key_age(True, generation)
         except asyncio.TimeoutError as ex:
             # timed out
+            self.request_stats["timeouts"] += 1
             raise SleepIQTimeoutException("API call timed out") from ex
+
+        # login and try again
+        await self.__relogin(generation)
+        if record:
+            record.retries += 1
+        return await self.__send_request(make_request, url, json, params, False, check, probe, write, record, reader)
+
+    async def __relogin(self, generation: int) -> None:
+        """Login again unless it already happened since the key generation was used."""
+        async with self._login_lock:
+            if generation == self._key_generation:
+                self.request_stats["relogins"] += 1
+                await self.login()
+
+    def __observe_key_age(self, expired: bool, generation: int) -> None:
+        """Update key_lifetime from the age of a key that was just accepted or rejected.
+
+        A key rejected early (revoked, server restart) says nothing about the
+        usual lifetime, so ages below MIN_KEY_LIFETIME and refresh_margin are
+        ignored, and a key outliving key_lifetime raises it again.
+        """
+        if self._login_time is None or generation != self._key_generation:
+            return
+        age = time.monotonic() - self._login_time
+        if self.key_lifetime is not None and age <= self.key_lifetime:
+            return
+        if expired and age >= max(MIN_KEY_LIFETIME, self.refresh_margin or 0):
+            self.key_lifetime = age
+        elif not expired and self.key_lifetime is not None:
+            self.key_lifetime = age
+
+    def __key_expiring(self) -> bool:
+        """Return true if the key is within refresh_margin of its observed lifetime."""
+        if self.refresh_margin is None or self.key_lifetime is None or self._login_time is None:
+            return False
+        if self.key_lifetime - self.refresh_margin <= 0:
+            return False
+        return time.monotonic() - self._login_time >= self.key_lifetime - self.refresh_margin
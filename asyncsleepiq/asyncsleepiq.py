@@ -1,14 +1,26 @@
 """AsyncSleepIQ class connects to the SleepIQ API and provides bed information."""
 from __future__ import annotations
 
+import asyncio
 from aiohttp import ClientSession
 import logging
+import os
+from typing import Any
 
-from .api import SleepIQAPI
+from .api import SleepIQAPI, gather_limited
 from .bed import SleepIQBed
-from .consts import LOGIN_KEY
+from .cache import ResponseCache
+from .capabilities import CapabilityCache
+from .consts import API_URL, DISCOVERY_CONCURRENCY, LOGIN_KEY, STATUS_CONCURRENCY
+from .credentials import CredentialStore
 from .fuzion.bed import SleepIQFuzionBed
-from .exceptions import SleepIQAPIException
+from .exceptions import SleepIQAPIException, SleepIQCircuitOpenException
+from .files import read_json_file, write_json_file
+from .rate_limit import RateLimiter
+from .retry import CircuitBreaker, RetryPolicy
+from .session import ConnectionOptions
+from .sleep_store import SleepDataStore
+from .topology import bed_to_dict, dump_topology, load_topology
 
 _LOGGER = logging.getLogger("ASyncSleepIQ")
 
@@ -22,58 +34,211 @@ class AsyncSleepIQ(SleepIQAPI):
         password: str | None = None,
         login_method: int = LOGIN_KEY,
         client_session: ClientSession | None = None,
+        cache: ResponseCache | None = None,
+        credential_store: CredentialStore | None = None,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+        connection_options: ConnectionOptions | None = None,
+        api_url: str = API_URL,
+        sleep_store: SleepDataStore | None = None,
+        capability_cache: CapabilityCache | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
     ) -> None:
         """Initialize AsyncSleepIQ."""
-        super().__init__(email, password, login_method, client_session)
+        super().__init__(
+            email,
+            password,
+            login_method,
+            client_session,
+            cache,
+            credential_store,
+            retry_policy,
+            rate_limiter,
+            connection_options,
+            api_url,
+            sleep_store,
+            capability_cache,
+            circuit_breaker,
+        )
         self.beds: dict[str, SleepIQBed] = {}
+        self.revalidation: asyncio.Task[None] | None = None
+
+    async def close_session(self) -> None:
+        """Stop any topology revalidation and close the API session."""
+        if self.revalidation is not None:
+            self.revalidation.cancel()
+        await super().close_session()
 
     # initialize beds and sleepers from API
-    async def init_beds(self) -> None:
-        """Initialize bed and sleeper objects from API data."""
-        data = await self.get("bed")
+    async def init_beds(self, concurrency: int = DISCOVERY_CONCURRENCY, lazy: bool = False) -> None:
+        """Initialize bed and sleeper objects from API data.
+
+        Up to concurrency beds are validated and have their foundation
+        discovered at the same time, use 1 to set up beds one at a time.
+        With lazy, foundations are only discovered by the first
+        update_foundation_status() or foundation.ensure_initialized(), so
+        deployments that only poll occupancy skip those requests.
+        """
+        discovered = await self._discover_beds(concurrency, lazy)
+        self.beds = {bed_id: bed for bed_id, bed in discovered.items() if bed is not None}
+
+    async def _discover_beds(
+        self, concurrency: int, lazy: bool = False, keep_going: bool = False
+    ) -> dict[str, SleepIQBed | None]:
+        """Return every bed listed by the API with its sleepers and foundation discovered.
 
-        self._account_id = data["beds"][0].get("accountId", "")
+        Beds that failed validation, or with keep_going foundation discovery,
+        are listed as None.
+        """
+        data, sleepers = await asyncio.gather(self.get("bed"), self.get("sleeper"))
+
+        account_id = data["beds"][0].get("accountId", "")
+        if account_id != self._account_id:
+            self._account_id = account_id
+            await self.save_credentials()
 
         # get beds
-        self.beds = {}
-        for bed_data in data["beds"]:
-            try:
-                if bed_data.get("generation", "") == "fuzion":
-                    bed = SleepIQFuzionBed(self, bed_data)
-                else:
-                    bed = SleepIQBed(self, bed_data)
-                if await bed.valid():
-                    self.beds[bed_data["bedId"]] = bed
-            except SleepIQAPIException as e:
-                _LOGGER.error(
-                    f"Received {e.code} error setting up bed: {bed_data.get('name', 'unknown')}, skipping..."
-                )
-
-        # get sleepers and assign to beds
-        data = await self.get("sleeper")
-        for sleeper_data in data["sleepers"]:
-            if sleeper_data["bedId"] not in self.beds:
+        beds = await gather_limited(
+            concurrency, *(self._init_bed(bed_data, lazy, keep_going) for bed_data in data["beds"])
+        )
+        discovered = {bed_data["bedId"]: bed for bed_data, bed in zip(data["beds"], beds)}
+
+        # assign sleepers to beds
+        for sleeper_data in sleepers["sleepers"]:
+            bed = discovered.get(sleeper_data["bedId"])
+            if bed is None:
                 continue
-            sleeper = self.beds[sleeper_data["bedId"]].sleepers[sleeper_data["side"]]
+            sleeper = bed.sleepers[sleeper_data["side"]]
             sleeper.name = sleeper_data["firstName"]
             sleeper.active = sleeper_data["active"]
+        return discovered
+
+    async def _init_bed(
+        self, bed_data: dict[str, Any], lazy: bool = False, keep_going: bool = False
+    ) -> SleepIQBed | None:
+        """Validate a single bed and initialize its foundation unless lazy.
+
+        Returns None if the bed isn't valid, or with keep_going if its
+        foundation discovery failed.
+        """
+        try:
+            if bed_data.get("generation", "") == "fuzion":
+                bed = SleepIQFuzionBed(self, bed_data)
+            else:
+                bed = SleepIQBed(self, bed_data)
+            if not await bed.valid():
+                return None
+        except SleepIQCircuitOpenException:
+            # not a problem with this bed, discovery as a whole can't finish
+            raise
+        except SleepIQAPIException as e:
+            _LOGGER.error(f"Received {e.code} error setting up bed: {bed_data.get('name', 'unknown')}, skipping...")
+            return None
+
+        # init foundation
+        if not lazy:
+            try:
+                await bed.foundation.ensure_initialized()
+            except Exception:
+                if not keep_going:
+                    raise
+                _LOGGER.exception(f"Could not discover foundation of bed {bed.name}")
+                return None
+        return bed
 
-        # init foundations
-        for bed in self.beds.values():
-            await bed.foundation.fetch_features()
-            await bed.foundation.init_features()
+    # topology snapshots for fast startup
+    async def save_topology(self, path: str | os.PathLike[str]) -> None:
+        """Save the discovered beds, sleepers and foundation features to a file."""
+        data = dump_topology(self._account_id, self.beds)
+        await asyncio.get_running_loop().run_in_executor(None, write_json_file, path, data)
+
+    async def restore_topology(
+        self, path: str | os.PathLike[str], revalidate: bool = True, concurrency: int = DISCOVERY_CONCURRENCY
+    ) -> bool:
+        """Initialize beds from a save_topology file without any API requests.
+
+        Returns False, leaving beds untouched, if the file is missing or was
+        saved for another account. Unless revalidate is False, discovery is
+        then run in the background (see revalidation) and any differences
+        are applied to beds and saved back to the file.
+        """
+        data = await asyncio.get_running_loop().run_in_executor(None, read_json_file, path)
+        if data is None or (self._account_id and data.get("accountId") != self._account_id):
+            return False
+        beds = load_topology(self, data)
+        if beds is None:
+            return False
+        self._account_id = data["accountId"]
+        self.beds = beds
+        if revalidate:
+            self.revalidation = asyncio.create_task(self.__revalidate(path, concurrency))
+        return True
+
+    async def revalidate_topology(self, concurrency: int = DISCOVERY_CONCURRENCY) -> bool:
+        """Rediscover beds from API, replacing those whose topology changed.
+
+        Beds whose topology is unchanged keep their objects and state. Only
+        beds no longer listed by the API are removed, beds that fail
+        validation or discovery (e.g. on a transient error) are kept as
+        they are. Returns True if anything changed.
+        """
+        changed, _ = await self.__revalidate_beds(concurrency)
+        return changed
+
+    async def __revalidate_beds(self, concurrency: int) -> tuple[bool, bool]:
+        """Revalidate beds, returning if anything changed and if every bed was validated."""
+        discovered = await self._discover_beds(concurrency, keep_going=True)
+        changed = False
+        complete = True
+        for bed_id in [bed_id for bed_id in self.beds if bed_id not in discovered]:
+            _LOGGER.info(f"Bed {self.beds[bed_id].name} no longer on account, removing")
+            del self.beds[bed_id]
+            changed = True
+        for bed_id, bed in discovered.items():
+            current = self.beds.get(bed_id)
+            if bed is None:
+                if current is not None:
+                    _LOGGER.warning(f"Could not revalidate bed {current.name}, keeping it")
+                complete = False
+            elif current is None or bed_to_dict(current) != bed_to_dict(bed):
+                _LOGGER.info(f"Topology of bed {bed.name} changed, replacing")
+                self.beds[bed_id] = bed
+                changed = True
+        return changed, complete
+
+    async def __revalidate(self, path: str | os.PathLike[str], concurrency: int) -> None:
+        """Revalidate restored topology, saving it if it changed and every bed was validated."""
+        try:
+            changed, complete = await self.__revalidate_beds(concurrency)
+            if changed and complete:
+                await self.save_topology(path)
+        except Exception:
+            _LOGGER.exception("Could not revalidate bed topology")
+
+    async def sync_sleep_data(self) -> int:
+        """Sync every sleeper's sleep data to sleep_store, returning the number of nights stored."""
+        sleepers = [sleeper for bed in self.beds.values() for sleeper in bed.sleepers]
+        return sum(await asyncio.gather(*(sleeper.sync_sleep_data() for sleeper in sleepers)))
 
     # update statuses of sleepers/beds
-    async def fetch_bed_statuses(self) -> None:
-        """Update bed/sleeper statuses from API."""
+    async def fetch_bed_statuses(self, concurrency: int = STATUS_CONCURRENCY) -> None:
+        """Update bed/sleeper statuses from API.
+
+        Sleepers that need their own request to update, like Fuzion
+        sleepers, are updated up to concurrency at a time.
+        """
         data = await self.get("bed/familyStatus")
-        for bed_status in data["beds"]:
-            if bed_status["bedId"] not in self.beds:
-                continue
-            for sleeper in self.beds[bed_status["bedId"]].sleepers:
-                sleeper_data = bed_status.get(sleeper.side_full.lower() + "Side")
-                if sleeper_data:
-                    sleeper.in_bed = sleeper_data["isInBed"]
-                    sleeper.pressure = sleeper_data["pressure"]
-                    sleeper.sleep_number = sleeper_data["sleepNumber"]
-                    await sleeper.update()
+        sleepers = [sleeper for bed in self.beds.values() for sleeper in bed.sleepers]
+        with self.event_bus.watch(sleepers):
+            updated = []
+            for bed_status in data["beds"]:
+                if bed_status["bedId"] not in self.beds:
+                    continue
+                for sleeper in self.beds[bed_status["bedId"]].sleepers:
+                    sleeper_data = bed_status.get(sleeper.side_full.lower() + "Side")
+                    if sleeper_data:
+                        sleeper.in_bed = sleeper_data["isInBed"]
+                        sleeper.pressure = sleeper_data["pressure"]
+                        sleeper.sleep_number = sleeper_data["sleepNumber"]
+                        updated.append(sleeper)
+            await gather_limited(concurrency, *(sleeper.update() for sleeper in updated))
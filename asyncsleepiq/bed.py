@@ -25,7 +25,7 @@ class SleepIQBed:
             for side in [Side.LEFT, Side.RIGHT]
             if data.get(f"sleeper{SIDES_FULL[side]}Id")
         ]
-        self.foundation = SleepIQFoundation(api, self.id)
+        self.foundation = SleepIQFoundation(api, self.id, self.mac_addr)
 
         self.model = "Unknown"
         if "model" in data:
@@ -55,7 +55,13 @@ class SleepIQBed:
         )
 
     async def valid(self) -> bool:
-        return await self._api.check("bed/" + self.id + "/pauseMode")
+        """Return true if the bed responds, updating paused from the same request."""
+        status, json = await self._api.probe("bed/" + self.id + "/pauseMode")
+        if status != 200:
+            return False
+        # an empty body means the bed responds but isn't paused
+        self.paused = (json or {}).get("pauseMode", "") == "on"
+        return True
 
     async def calibrate(self) -> None:
         """Calibrate or "baseline" bed."""
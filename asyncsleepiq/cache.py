@@ -0,0 +1,82 @@
+"""Response cache for SleepIQ API."""
+from __future__ import annotations
+
+from collections import OrderedDict
+import time
+from typing import Any
+
+from .consts import CACHE_MAX_SIZE, CACHE_TTLS
+
+
+class ResponseCache:
+    """Bounded LRU cache of API read responses with per-endpoint TTLs.
+
+    TTLs are keyed by endpoint template (e.g. "bed/{id}/sleepNumberFavorite")
+    or bamkey command name (e.g. "GetFavoriteSleepNumber"); reads of
+    endpoints without a TTL are not cached. Entries belong to a scope such
+    as "bed/{bed_id}" so writes can invalidate every read they may affect.
+    SleepIQAPI keys responses by account email, so one cache can be shared
+    by several clients, and hands every caller its own copy.
+    """
+
+    def __init__(self, ttls: dict[str, float] | None = None, max_size: int = CACHE_MAX_SIZE) -> None:
+        """Initialize response cache."""
+        self.ttls = dict(CACHE_TTLS if ttls is None else ttls)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[tuple[Any, ...], tuple[float, str, Any]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+
+    def __str__(self) -> str:
+        """Return string representation."""
+        return f"ResponseCache(size={len(self._entries)}/{self.max_size}, hits={self.hits}, misses={self.misses})"
+
+    __repr__ = __str__
+
+    def __len__(self) -> int:
+        """Return number of cached responses."""
+        return len(self._entries)
+
+    def ttl(self, endpoint: str) -> float | None:
+        """Return the TTL for an endpoint template or command, None if not cached."""
+        return self.ttls.get(endpoint)
+
+    def get(self, key: tuple[Any, ...]) -> Any | None:
+        """Return an unexpired cached response or None."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[2]
+
+    def generation(self, scope: str) -> int:
+        """Return the write generation of a scope, taken before a read starts."""
+        return self._generations.get(scope, 0)
+
+    def set(self, key: tuple[Any, ...], scope: str, value: Any, ttl: float, generation: int) -> None:
+        """Store a response unless a write to its scope happened since generation."""
+        if value is None or self.generation(scope) != generation:
+            return
+        self._entries[key] = (time.monotonic() + ttl, scope, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, scope: str) -> None:
+        """Drop every cached response in scope."""
+        self._generations[scope] = self.generation(scope) + 1
+        for key in [key for key, entry in self._entries.items() if entry[1] == scope]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        for scope in {entry[1] for entry in self._entries.values()}:
+            self._generations[scope] = self.generation(scope) + 1
+        self._entries.clear()
@@ -0,0 +1,86 @@
+"""Cache of foundation hardware capabilities for SleepIQ API."""
+from __future__ import annotations
+
+import asyncio
+import copy
+import os
+import time
+from typing import Any
+
+from .consts import CAPABILITY_TTL
+from .files import read_json_file, write_json_file
+
+
+class CapabilityCache:
+    """Answers of capability queries (like GetFootwarmingPresence) by bed id and MAC address.
+
+    Entries expire ttl seconds after the first answer for a bed was stored,
+    and are keyed by MAC address too so swapped hardware is queried again.
+    With a path the cache is kept in a JSON file to last across restarts.
+    """
+
+    def __init__(self, path: str | os.PathLike[str] | None = None, ttl: float = CAPABILITY_TTL) -> None:
+        """Initialize capability cache."""
+        self.path = os.fspath(path) if path is not None else None
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, dict[str, Any]] | None = None
+        self._dirty = False
+        self._lock = asyncio.Lock()
+
+    def __str__(self) -> str:
+        """Return string representation."""
+        return f"CapabilityCache({self.path}, hits={self.hits}, misses={self.misses})"
+
+    __repr__ = __str__
+
+    async def get(self, bed_id: str, mac_addr: str, key: str) -> str | None:
+        """Return the cached answer of a capability query or None."""
+        entry = (await self._load()).get(f"{bed_id}/{mac_addr}")
+        value = None
+        if entry is not None and time.time() - entry["obtained_at"] < self.ttl:
+            value = entry["values"].get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, bed_id: str, mac_addr: str, key: str, value: str) -> None:
+        """Store the answer of a capability query, call save() to write it to the file."""
+        entries = await self._load()
+        entry = entries.get(f"{bed_id}/{mac_addr}")
+        if entry is None or time.time() - entry["obtained_at"] >= self.ttl:
+            entry = entries[f"{bed_id}/{mac_addr}"] = {"obtained_at": time.time(), "values": {}}
+        entry["values"][key] = value
+        self._dirty = True
+
+    async def invalidate(self, bed_id: str | None = None) -> None:
+        """Forget the capabilities of a bed, or of every bed, and save."""
+        entries = await self._load()
+        for entry_key in [k for k in entries if bed_id is None or k.split("/")[0] == bed_id]:
+            del entries[entry_key]
+            self._dirty = True
+        await self.save()
+
+    async def save(self) -> None:
+        """Write changes to the file, if there's one."""
+        if self.path is None or not self._dirty:
+            return
+        entries = await self._load()
+        async with self._lock:
+            self._dirty = False
+            # written from a copy, entries may change while the file is written
+            await asyncio.get_running_loop().run_in_executor(None, write_json_file, self.path, copy.deepcopy(entries))
+
+    async def _load(self) -> dict[str, dict[str, Any]]:
+        """Return the entries, reading the file the first time."""
+        if self._entries is None:
+            async with self._lock:
+                if self._entries is None:
+                    entries = None
+                    if self.path is not None:
+                        entries = await asyncio.get_running_loop().run_in_executor(None, read_json_file, self.path)
+                    self._entries = entries or {}
+        return self._entries
@@ -3,6 +3,48 @@ import enum
 
 API_URL = "https://prod-api.sleepiq.sleepnumber.com/rest"
 TIMEOUT = 10
+# Shortest key lifetime (seconds) trusted for proactive key refresh
+MIN_KEY_LIFETIME = 60
+
+# Number of beds discovered at the same time by init_beds
+DISCOVERY_CONCURRENCY = 4
+# Number of requests in flight at once for a single bed's foundation refresh
+FOUNDATION_CONCURRENCY = 12
+# Number of sleepers refreshed at the same time by fetch_bed_statuses
+STATUS_CONCURRENCY = 16
+# Number of sleepData requests in flight at once for get_sleep_history
+HISTORY_CONCURRENCY = 4
+
+# Nights sync_sleep_data fetches again for late data, and fetches on a first sync
+SLEEP_SYNC_RECHECK_DAYS = 3
+SLEEP_SYNC_INITIAL_DAYS = 30
+
+# Bytes read at a time from streamed sleepData responses
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Nights returned by each sleepData interval, ending at the requested date
+SLEEP_DATA_INTERVALS = {"D1": 1, "W1": 7, "M1": 30}
+
+# Default response cache TTLs (seconds) by endpoint template or bamkey command,
+# foundation capabilities are cached by CapabilityCache instead
+CACHE_TTLS = {
+    "sleeper": 300,
+    "bed/{id}/sleepNumberFavorite": 60,
+    "GetFavoriteSleepNumber": 60,
+}
+CACHE_MAX_SIZE = 256
+
+# Seconds foundation capabilities stay in a CapabilityCache
+CAPABILITY_TTL = 7 * 24 * 3600
+
+# Default client side rate limits (requests per second and burst size)
+READ_RATE = 10.0
+READ_BURST = 20
+WRITE_RATE = 2.0
+WRITE_BURST = 5
+
+# Upper bounds (seconds) of request latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
 
 LOGIN_KEY = 1
 LOGIN_COOKIE = 2
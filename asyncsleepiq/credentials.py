@@ -0,0 +1,85 @@
+"""Authentication state storage for SleepIQ API."""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import asyncio
+from dataclasses import asdict, dataclass, field
+import os
+from typing import Any
+
+from .files import read_json_file, write_json_file
+
+
+@dataclass
+class Credentials:
+    """Authentication state of an account saved between process restarts."""
+
+    login_method: int
+    key: str = ""                # session key (key login)
+    authorization: str = ""      # Authorization header (cookie login)
+    cookies: dict[str, str] = field(default_factory=dict)
+    account_id: str = ""
+    obtained_at: float = 0.0     # unix time of the login
+
+
+class CredentialStore(ABC):
+    """Base class for storing authentication state by account email."""
+
+    @abstractmethod
+    async def load(self, email: str) -> Credentials | None:
+        """Return stored credentials for email or None."""
+
+    @abstractmethod
+    async def save(self, email: str, credentials: Credentials) -> None:
+        """Store credentials for email."""
+
+    @abstractmethod
+    async def clear(self, email: str) -> None:
+        """Remove stored credentials for email."""
+
+
+class FileCredentialStore(CredentialStore):
+    """Credential store keeping every account in one JSON file readable only by the owner."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """Initialize file credential store."""
+        self.path = os.fspath(path)
+        self._lock = asyncio.Lock()
+
+    def __str__(self) -> str:
+        """Return string representation."""
+        return f"FileCredentialStore({self.path})"
+
+    __repr__ = __str__
+
+    async def load(self, email: str) -> Credentials | None:
+        """Return stored credentials for email or None."""
+        async with self._lock:
+            data = await asyncio.get_running_loop().run_in_executor(None, read_json_file, self.path) or {}
+        if email not in data:
+            return None
+        try:
+            return Credentials(**data[email])
+        except TypeError:
+            return None
+
+    async def save(self, email: str, credentials: Credentials) -> None:
+        """Store credentials for email."""
+        await self._update(email, asdict(credentials))
+
+    async def clear(self, email: str) -> None:
+        """Remove stored credentials for email."""
+        await self._update(email, None)
+
+    async def _update(self, email: str, value: dict[str, Any] | None) -> None:
+        """Replace or remove the entry for email in the file."""
+        def update() -> None:
+            data = read_json_file(self.path) or {}
+            if value is None:
+                data.pop(email, None)
+            else:
+                data[email] = value
+            write_json_file(self.path, data)
+
+        async with self._lock:
+            await asyncio.get_running_loop().run_in_executor(None, update)
@@ -0,0 +1,82 @@
+"""Debounced, coalescing writes for SleepIQ API commands."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+
+class CoalescingWriter:
+    """Debounces calls of a command, sending only the latest arguments of each burst.
+
+    write() waits until no other write came for window seconds, then the
+    command is sent once with the latest arguments and every write of the
+    burst returns (or raises) when it is acknowledged. Writes made while
+    a command is being sent start the next burst, which is sent after it.
+    """
+
+    def __init__(self, send: Callable[..., Awaitable[None]], window: float = 0.0) -> None:
+        """Initialize coalescing writer."""
+        self.send = send
+        self.window = window
+        self.sent = 0
+        self.coalesced = 0
+        self._args: tuple[Any, ...] = ()
+        self._result: asyncio.Future[None] | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        self._lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def __str__(self) -> str:
+        """Return string representation."""
+        return f"CoalescingWriter(window={self.window}, sent={self.sent}, coalesced={self.coalesced})"
+
+    __repr__ = __str__
+
+    async def write(self, *args: Any) -> None:
+        """Send the command with args, unless another write comes within the window."""
+        loop = asyncio.get_running_loop()
+        if self._result is None:
+            self._result = loop.create_future()
+        else:
+            self.coalesced += 1
+        self._args = args
+        result = self._result
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = loop.call_later(self.window, self.__flush)
+        # a cancelled caller mustn't cancel the command of the other callers
+        await asyncio.shield(result)
+
+    async def flush(self) -> None:
+        """Send a pending burst now and wait for it."""
+        result = self._result
+        if result is not None:
+            self.__flush()
+            await asyncio.shield(result)
+
+    def __flush(self) -> None:
+        """Start sending the pending burst."""
+        if self._timer is not None:
+            self._timer.cancel()
+        result, args = self._result, self._args
+        self._result, self._args, self._timer = None, (), None
+        if result is None:
+            return
+        task = asyncio.get_running_loop().create_task(self.__send(result, args))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def __send(self, result: asyncio.Future[None], args: tuple[Any, ...]) -> None:
+        """Send a burst after the one before it and complete its writes."""
+        async with self._lock:
+            try:
+                await self.send(*args)
+            except asyncio.CancelledError:
+                result.cancel()
+                raise
+            except Exception as err:
+                result.set_exception(err)
+            else:
+                result.set_result(None)
+            self.sent += 1
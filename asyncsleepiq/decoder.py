@@ -0,0 +1,28 @@
+"""JSON decoding of SleepIQ API responses."""
+from __future__ import annotations
+
+from collections.abc import Callable
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+# Decodes a response body, must raise ValueError for invalid JSON
+JSONLoads = Callable[[bytes], Any]
+
+
+def default_json_loads() -> JSONLoads:
+    """Return the fastest installed JSON decoder: orjson, msgspec or the standard library."""
+    if orjson is not None:
+        return orjson.loads
+    if msgspec is not None:
+        return msgspec.json.Decoder().decode
+    return json.loads
@@ -0,0 +1,521 @@
+"""Local SleepIQ API emulator for load testing and benchmarks.
+
+Serves the REST endpoints and bamkey commands used by this package from
+in-memory beds, with configurable latency and fault injection. Point a
+client at it with AsyncSleepIQ(api_url=emulator.url) and LOGIN_KEY.
+
+    async with SleepIQEmulator(beds=2, fuzion_beds=2) as emulator:
+        api = AsyncSleepIQ("user@example.com", "pass", api_url=emulator.url)
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import random
+import secrets
+import time
+from typing import Any
+
+from aiohttp import web
+
+from .api import endpoint_template
+from .consts import (
+    BAMKEY,
+    BED_LIGHTS,
+    BED_PRESETS,
+    FOUNDATION_TYPES,
+    SLEEP_DATA_INTERVALS,
+    CoreTemps,
+    FootWarmingTemps,
+)
+
+# Fuzion preset values and the names classic foundations report them with
+PRESET_NAMES = {
+    "flat": "Flat",
+    "favorite": "Favorite",
+    "read": "Read",
+    "watch_tv": "Watch TV",
+    "zero_g": "Zero G",
+    "snore": "Snore",
+}
+BAMKEY_NAMES = {code: name for name, code in BAMKEY.items()}
+
+
+def fixed_latency(seconds: float) -> Callable[[], float]:
+    """Return a latency distribution that always takes seconds."""
+    return lambda: seconds
+
+
+def uniform_latency(low: float, high: float) -> Callable[[], float]:
+    """Return a latency distribution uniform between low and high seconds."""
+    return lambda: random.uniform(low, high)
+
+
+def lognormal_latency(median: float, sigma: float = 0.5) -> Callable[[], float]:
+    """Return a long tailed latency distribution around median seconds."""
+    return lambda: median * random.lognormvariate(0, sigma)
+
+
+@dataclass
+class FaultConfig:
+    """Latency and faults injected by the emulator."""
+
+    latency: Callable[[], float] | None = None  # seconds added to every request
+    key_lifetime: float | None = None           # seconds before a login key is rejected with 401
+    error_rate: float = 0.0                     # probability of a 503 response
+    timeout_rate: float = 0.0                   # probability of not answering for timeout_delay
+    timeout_delay: float = 30.0
+    rate_limit: float | None = None             # requests per second before answering 429
+
+
+class _Motion:
+    """A value moving towards a target at speed units per second."""
+
+    def __init__(self, value: int, speed: float) -> None:
+        self.start = value
+        self.target = value
+        self.speed = speed
+        self.started = time.monotonic()
+
+    @property
+    def value(self) -> int:
+        moved = (time.monotonic() - self.started) * self.speed
+        if self.target >= self.start:
+            return int(min(self.target, self.start + moved))
+        return int(max(self.target, self.start - moved))
+
+    @property
+    def moving(self) -> bool:
+        return self.value != self.target
+
+    def move_to(self, target: int) -> None:
+        self.start = self.value
+        self.target = target
+        self.started = time.monotonic()
+
+    def stop(self) -> None:
+        self.move_to(self.value)
+
+
+@dataclass
+class EmulatedSleeper:
+    """Sleeper state of an emulated bed side."""
+
+    sleeper_id: str
+    first_name: str
+    sleep_number: _Motion = field(default_factory=lambda: _Motion(50, 5))
+    favorite: int = 50
+    in_bed: bool = False
+    pressure: int = 1000
+
+
+@dataclass
+class EmulatedBed:
+    """State of an emulated bed and its foundation."""
+
+    bed_id: str
+    name: str
+    mac_addr: str
+    fuzion: bool
+    sleepers: dict[str, EmulatedSleeper]
+    foundation_type: int = 2  # index into FOUNDATION_TYPES
+    features: int = 0b11011   # fsBoardFeatures bits
+    paused: bool = False
+    actuators: dict[tuple[str, str], _Motion] = field(default_factory=dict)
+    presets: dict[str, str] = field(default_factory=dict)
+    lights: dict[int, bool] = field(default_factory=dict)
+    foot_warming: dict[str, tuple[int, int]] = field(default_factory=dict)
+    climate: dict[str, tuple[int, int]] = field(default_factory=dict)
+
+
+class SleepIQEmulator:
+    """Local aiohttp server emulating the SleepIQ API."""
+
+    def __init__(
+        self,
+        beds: int = 1,
+        fuzion_beds: int = 0,
+        faults: FaultConfig | None = None,
+        slices_per_night: int = 480,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize emulator with beds classic and fuzion_beds Fuzion beds."""
+        self.faults = faults or FaultConfig()
+        self.slices_per_night = slices_per_night
+        self.account_id = "-1000000000000000001"
+        self.beds: dict[str, EmulatedBed] = {}
+        self.requests: Counter[str] = Counter()
+        self.url = ""
+        self._keys: dict[str, float] = {}
+        self._random = random.Random(seed)
+        self._tokens = 0.0
+        self._tokens_updated = time.monotonic()
+        self._runner: web.AppRunner | None = None
+        for i in range(beds + fuzion_beds):
+            self.add_bed(fuzion=i >= beds)
+
+    def __str__(self) -> str:
+        """Return string representation."""
+        return f"SleepIQEmulator({self.url or 'stopped'}, beds={len(self.beds)}, requests={self.request_count})"
+
+    __repr__ = __str__
+
+    @property
+    def request_count(self) -> int:
+        """Return number of requests served."""
+        return sum(self.requests.values())
+
+    def add_bed(self, fuzion: bool = False) -> EmulatedBed:
+        """Add a bed with two sleepers and a fully featured foundation."""
+        n = len(self.beds)
+        bed_id = f"-{9000000000000000000 + n}"
+        sleepers = {
+            side: EmulatedSleeper(f"-{8000000000000000000 + 2 * n + i}", f"Sleeper{2 * n + i}")
+            for i, side in enumerate(("left", "right"))
+        }
+        bed = EmulatedBed(bed_id, f"Bed {n}", f"64DBA0{n:06X}", fuzion, sleepers)
+        for side in ("left", "right"):
+            for end in ("head", "foot"):
+                bed.actuators[(side, end)] = _Motion(0, 10)
+            bed.presets[side] = "flat"
+            bed.foot_warming[side] = (0, 0)
+            bed.climate[side] = (0, 0)
+        for light in BED_LIGHTS:
+            bed.lights[light] = False
+        self.beds[bed_id] = bed
+        return bed
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the base URL to use as api_url."""
+        app = web.Application()
+        app.router.add_route("*", "/rest/{path:.*}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f"http://{host}:{port}/rest"
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+            self.url = ""
+
+    async def __aenter__(self) -> SleepIQEmulator:
+        """Start emulator."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Stop emulator."""
+        await self.stop()
+
+    def expire_keys(self) -> None:
+        """Invalidate every login key so the next requests get 401."""
+        self._keys.clear()
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        """Apply injected faults and dispatch a request."""
+        path = request.match_info["path"]
+        faults = self.faults
+        if faults.latency:
+            await asyncio.sleep(faults.latency())
+        if faults.rate_limit and not self._take_token(faults.rate_limit):
+            self.requests["429"] += 1
+            return web.Response(status=429)
+        if faults.timeout_rate and self._random.random() < faults.timeout_rate:
+            await asyncio.sleep(faults.timeout_delay)
+        if faults.error_rate and self._random.random() < faults.error_rate:
+            self.requests["503"] += 1
+            return web.Response(status=503)
+
+        json = await request.json() if request.can_read_body else {}
+        if path == "login" and request.method == "PUT":
+            self.requests["login"] += 1
+            return self._login(json)
+        if not self._valid_key(request.query.get("_k", "")):
+            self.requests["401"] += 1
+            return web.Response(status=401)
+
+        parts = path.split("/")
+        if parts[-1] == "bamkey":
+            self.requests[f"bamkey:{BAMKEY_NAMES.get(json.get('key', ''), '?')}"] += 1
+        else:
+            self.requests[f"{request.method} {endpoint_template(path)}"] += 1
+        try:
+            data = self._dispatch(request.method, parts, request.query, json)
+        except KeyError:
+            return web.Response(status=404)
+        return web.json_response(data)
+
+    def _take_token(self, rate: float) -> bool:
+        """Take a request token from the server side rate limit bucket."""
+        now = time.monotonic()
+        self._tokens = min(rate, self._tokens + (now - self._tokens_updated) * rate)
+        self._tokens_updated = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def _login(self, json: dict[str, Any]) -> web.Response:
+        """Issue a new login key."""
+        if not json.get("login") or not json.get("password"):
+            return web.Response(status=401)
+        key = secrets.token_hex(8)
+        self._keys[key] = time.monotonic()
+        return web.json_response({"userId": "-1", "key": key, "registrationState": 13})
+
+    def _valid_key(self, key: str) -> bool:
+        """Return true if key was issued and has not expired."""
+        issued = self._keys.get(key)
+        if issued is None:
+            return False
+        lifetime = self.faults.key_lifetime
+        return lifetime is None or time.monotonic() - issued < lifetime
+
+    def _dispatch(self, method: str, parts: list[str], query: Any, json: dict[str, Any]) -> Any:
+        """Return the response for a REST path, KeyError for unknown paths."""
+        if parts == ["user", "jwt"]:
+            return {}
+        if parts == ["bed"]:
+            return {"beds": [self._bed_json(bed) for bed in self.beds.values()]}
+        if parts == ["sleeper"]:
+            return {"sleepers": [self._sleeper_json(bed, side) for bed in self.beds.values() for side in bed.sleepers]}
+        if parts == ["bed", "familyStatus"]:
+            return {"beds": [self._family_status_json(bed) for bed in self.beds.values()]}
+        if parts == ["sleepData"]:
+            return self._sleep_data(query)
+        if parts[0] == "sleeper" and parts[2:] == ["calibrate"]:
+            return {}
+        if parts[0] == "sn" and parts[-1] == "bamkey":
+            return {"cdcResponse": "PASS:" + self._bamkey(self.beds[parts[5]], json)}
+        if parts[0] == "bed":
+            return self._bed_endpoint(self.beds[parts[1]], method, "/".join(parts[2:]), query, json)
+        raise KeyError(parts)
+
+    def _bed_json(self, bed: EmulatedBed) -> dict[str, Any]:
+        return {
+            "accountId": self.account_id,
+            "bedId": bed.bed_id,
+            "name": bed.name,
+            "macAddress": bed.mac_addr,
+            "model": "P6" if not bed.fuzion else "FFC5",
+            "generation": "fuzion" if bed.fuzion else "360",
+            "sleeperLeftId": bed.sleepers["left"].sleeper_id,
+            "sleeperRightId": bed.sleepers["right"].sleeper_id,
+        }
+
+    def _sleeper_json(self, bed: EmulatedBed, side: str) -> dict[str, Any]:
+        sleeper = bed.sleepers[side]
+        return {
+            "sleeperId": sleeper.sleeper_id,
+            "bedId": bed.bed_id,
+            "firstName": sleeper.first_name,
+            "active": True,
+            "side": 0 if side == "left" else 1,
+        }
+
+    def _family_status_json(self, bed: EmulatedBed) -> dict[str, Any]:
+        status: dict[str, Any] = {"bedId": bed.bed_id, "status": 1}
+        for side, sleeper in bed.sleepers.items():
+            status[f"{side}Side"] = {
+                "isInBed": sleeper.in_bed,
+                "pressure": sleeper.pressure,
+                "sleepNumber": sleeper.sleep_number.value,
+                "alertDetailedMessage": "No Alert",
+            }
+        return status
+
+    def _bed_endpoint(self, bed: EmulatedBed, method: str, path: str, query: Any, json: dict[str, Any]) -> Any:
+        """Handle classic bed/{id}/... endpoints."""
+        put = method == "PUT"
+        if path == "pauseMode":
+            if put:
+                bed.paused = query.get("mode") == "on"
+            return {"pauseMode": "on" if bed.paused else "off"}
+        if path == "pump/forceIdle":
+            for sleeper in bed.sleepers.values():
+                sleeper.sleep_number.stop()
+            return {}
+        if path == "sleepNumber" and put:
+            bed.sleepers[_side(json["side"])].sleep_number.move_to(int(json["sleepNumber"]))
+            return {}
+        if path == "sleepNumberFavorite":
+            if put:
+                bed.sleepers[_side(json["side"])].favorite = int(json["sleepNumberFavorite"])
+            return {f"sleepNumberFavorite{side.title()}": s.favorite for side, s in bed.sleepers.items()}
+        if not path.startswith("foundation") or bed.fuzion:
+            raise KeyError(path)
+        if path == "foundation/system":
+            return {"fsBoardFeatures": bed.features, "fsBedType": bed.foundation_type}
+        if path == "foundation/status":
+            status: dict[str, Any] = {}
+            for (side, end), actuator in bed.actuators.items():
+                status[f"fs{side.title()}{end.title()}Position"] = f"{actuator.value:x}"
+            for side, preset in bed.presets.items():
+                status[f"fsCurrentPositionPreset{side.title()}"] = PRESET_NAMES.get(preset, "Not at preset")
+            status["fsIsMoving"] = any(a.moving for a in bed.actuators.values())
+            return status
+        if path == "foundation/outlet":
+            outlet = int(query.get("outletId", 0) if not put else json["outletId"])
+            if outlet not in bed.lights:
+                raise KeyError(outlet)
+            if put:
+                bed.lights[outlet] = bool(json["setting"])
+            return {"outlet": outlet, "setting": 1 if bed.lights[outlet] else 0, "timer": None}
+        if path == "foundation/footwarming":
+            if put:
+                for side in ("left", "right"):
+                    if f"footWarmingTemp{side.title()}" in json:
+                        bed.foot_warming[side] = (
+                            int(json[f"footWarmingTemp{side.title()}"]),
+                            int(json.get(f"footWarmingTimer{side.title()}", 0)),
+                        )
+            data = {}
+            for side, (temp, timer) in bed.foot_warming.items():
+                data[f"footWarmingStatus{side.title()}"] = temp
+                data[f"footWarmingTimer{side.title()}"] = timer
+            return data
+        if path == "foundation/adjustment/micro" and put:
+            side = _side(json["side"])
+            end = "head" if json["actuator"] == "H" else "foot"
+            sides = ["left", "right"] if FOUNDATION_TYPES[bed.foundation_type] != "splitKing" else [side]
+            for s in sides:
+                bed.actuators[(s, end)].move_to(int(json["position"]))
+            return {}
+        if path == "foundation/preset" and put:
+            name = next(name for name, num in BED_PRESETS.items() if num == json["preset"])
+            bed.presets[_side(json["side"])] = next(k for k, v in PRESET_NAMES.items() if v == name)
+            return {}
+        if path in ("foundation/motion", "foundation/adjustment") and put:
+            for actuator in bed.actuators.values():
+                actuator.stop()
+            return {}
+        raise KeyError(path)
+
+    def _bamkey(self, bed: EmulatedBed, json: dict[str, Any]) -> str:
+        """Handle a Fuzion bamkey command."""
+        command = BAMKEY_NAMES[json["key"]]
+        args = json.get("args", "").split()
+        side = args[0] if args else "left"
+        if command == "GetSystemConfiguration":
+            return "dual " + " ".join(["yes"] * 15)
+        if command == "HaltAllActuators":
+            for actuator in bed.actuators.values():
+                actuator.stop()
+            return ""
+        if command == "GetSleepiqPrivacyState":
+            return "paused" if bed.paused else "active"
+        if command == "SetSleepiqPrivacyState":
+            bed.paused = args[0] == "paused"
+            return ""
+        if command == "InterruptSleepNumberAdjustment":
+            for sleeper in bed.sleepers.values():
+                sleeper.sleep_number.stop()
+            return ""
+        if command == "StartSleepNumberAdjustment":
+            bed.sleepers[side].sleep_number.move_to(int(args[1]))
+            return ""
+        if command == "GetSleepNumberControls":
+            number = bed.sleepers[side].sleep_number
+            return f"{1 if number.moving else 0} {number.value} {number.target}"
+        if command == "SetFavoriteSleepNumber":
+            bed.sleepers[side].favorite = int(args[1])
+            return ""
+        if command == "GetFavoriteSleepNumber":
+            return str(bed.sleepers[side].favorite)
+        if command == "SetUnderbedLightSettings":
+            bed.lights[1] = args[0] != "off"
+            return ""
+        if command == "GetUnderbedLightSettings":
+            return ("high" if bed.lights[1] else "off") + " 0"
+        if command == "GetActuatorPosition":
+            return str(bed.actuators[(side, args[1])].value)
+        if command == "SetActuatorTargetPosition":
+            bed.actuators[(side, args[1])].move_to(int(args[2]))
+            return ""
+        if command == "SetTargetPresetWithoutTimer":
+            bed.presets[side] = args[1]
+            return ""
+        if command == "GetCurrentPreset":
+            return bed.presets[side]
+        if command in ("GetFootwarmingPresence", "GetHeidiPresence"):
+            return "1" if command == "GetFootwarmingPresence" else "true"
+        if command == "GetClimatePresence":
+            return "false"
+        if command == "SetFootwarmingSettings":
+            bed.foot_warming[side] = (FootWarmingTemps[args[1].upper()], int(args[2]))
+            return ""
+        if command == "GetFootwarmingSettings":
+            temp, timer = bed.foot_warming[side]
+            return f"{FootWarmingTemps(temp).name.lower()} {timer}"
+        if command in ("SetHeidiMode", "SetClimateMode"):
+            bed.climate[side] = (CoreTemps[args[1].upper()], int(args[2]))
+            return ""
+        if command in ("GetHeidiMode", "GetClimateMode"):
+            temp, timer = bed.climate[side]
+            return f"{CoreTemps(temp).name.lower()} {timer}"
+        raise KeyError(command)
+
+    def _sleep_data(self, query: Any) -> dict[str, Any]:
+        """Generate repeatable sleep data for the nights of an interval ending at date."""
+        sleeper_id = query["sleeper"]
+        end = datetime.strptime(query["date"][:10], "%Y-%m-%d")
+        slices = query.get("includeSlices", "false") == "true"
+        days = []
+        for offset in reversed(range(SLEEP_DATA_INTERVALS.get(query.get("interval", "D1"), 1))):
+            date = (end - timedelta(days=offset)).strftime("%Y-%m-%d")
+            days.append(self._night(sleeper_id, date, slices))
+        sessions = [session for day in days for session in day["sessions"]]
+        return {
+            "sleeperId": sleeper_id,
+            "sleepData": days,
+            "inBedTotal": sum(session["inBed"] for session in sessions),
+            "avgSleepIQ": round(sum(s["sleepQuotient"] for s in sessions) / len(sessions)) if sessions else 0,
+        }
+
+    def _night(self, sleeper_id: str, date: str, slices: bool) -> dict[str, Any]:
+        """Generate the sleep data of one night."""
+        rng = random.Random(f"{sleeper_id}{date}")
+        start = datetime.strptime(date, "%Y-%m-%d") - timedelta(hours=rng.randint(1, 3))
+        in_bed = rng.randint(6 * 3600, 9 * 3600)
+        session = {
+            "startDate": start.isoformat(),
+            "endDate": (start + timedelta(seconds=in_bed)).isoformat(),
+            "longest": True,
+            "inBed": in_bed,
+            "totalSleepSessionTime": in_bed,
+            "sleepQuotient": rng.randint(50, 95),
+            "avgHeartRate": rng.randint(50, 70),
+            "avgRespirationRate": rng.randint(12, 18),
+            "hrv": rng.randint(20, 80),
+            "restful": int(in_bed * 0.7),
+            "restless": int(in_bed * 0.25),
+            "outOfBed": in_bed - int(in_bed * 0.7) - int(in_bed * 0.25),
+            "fallAsleepPeriod": rng.randint(300, 1800),
+        }
+        night: dict[str, Any] = {"date": date, "sessions": [session]}
+        if slices:
+            night["sliceList"] = [
+                {
+                    "type": rng.randint(0, 3),
+                    "outOfBedTime": 0,
+                    "restfulTime": rng.randint(0, 60),
+                    "restlessTime": rng.randint(0, 60),
+                    "heartRate": rng.randint(50, 70),
+                    "respirationRate": rng.randint(12, 18),
+                }
+                for _ in range(self.slices_per_night)
+            ]
+        return night
+
+
+def _side(short: str) -> str:
+    return "left" if short == "L" else "right"
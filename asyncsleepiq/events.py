@@ -0,0 +1,144 @@
+"""Change events for SleepIQ entity state."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+import time
+from typing import Any
+
+# Entity attributes compared before and after each refresh
+WATCHED_FIELDS = (
+    "in_bed",
+    "pressure",
+    "sleep_number",
+    "is_updating",
+    "position",
+    "preset",
+    "is_on",
+    "timer",
+    "temperature",
+)
+
+OVERFLOW_DROP = "drop"
+OVERFLOW_COALESCE = "coalesce"
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """A single field of an entity changing value."""
+
+    bed_id: str
+    entity: Any  # sleeper, light, actuator, preset, foot warmer or core climate
+    field: str
+    old: Any
+    new: Any
+    timestamp: float  # time.time() of the refresh that found the change
+
+
+class EventSubscription:
+    """Bounded queue of change events for one subscriber.
+
+    When the queue is full new events are discarded with overflow "drop".
+    With "coalesce" a queued event for the same entity and field is updated
+    to the new value instead (or removed if it changed back), and if there
+    is none the oldest event is discarded. Discarded events are counted in
+    dropped.
+    """
+
+    def __init__(self, maxsize: int, overflow: str) -> None:
+        """Initialize subscription."""
+        if overflow not in (OVERFLOW_DROP, OVERFLOW_COALESCE):
+            raise ValueError(f"Invalid overflow: {overflow}")
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.dropped = 0
+        self._events: deque[ChangeEvent] = deque()
+        self._ready = asyncio.Event()
+
+    def __str__(self) -> str:
+        """Return string representation."""
+        return f"EventSubscription[{self.overflow}](queued={len(self._events)}, dropped={self.dropped})"
+
+    __repr__ = __str__
+
+    def put(self, event: ChangeEvent) -> None:
+        """Queue an event."""
+        if len(self._events) >= self.maxsize:
+            if self.overflow == OVERFLOW_DROP:
+                self.dropped += 1
+                return
+            for i, queued in enumerate(self._events):
+                if queued.entity is event.entity and queued.field == event.field:
+                    if queued.old == event.new:  # changed back, nothing to report
+                        del self._events[i]
+                    else:
+                        self._events[i] = replace(queued, new=event.new, timestamp=event.timestamp)
+                    return
+            self._events.popleft()
+            self.dropped += 1
+        self._events.append(event)
+        self._ready.set()
+
+    async def get(self) -> ChangeEvent:
+        """Wait for and return the next event."""
+        while not self._events:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._events.popleft()
+
+
+class EventBus:
+    """Distributes change events found by refreshes to subscribers."""
+
+    def __init__(self) -> None:
+        """Initialize event bus."""
+        self.subscriptions: list[EventSubscription] = []
+
+    def __str__(self) -> str:
+        """Return string representation."""
+        return f"EventBus(subscriptions={len(self.subscriptions)})"
+
+    __repr__ = __str__
+
+    def subscribe(self, maxsize: int = 1000, overflow: str = OVERFLOW_COALESCE) -> EventSubscription:
+        """Return a new subscription receiving every future event."""
+        subscription = EventSubscription(maxsize, overflow)
+        self.subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: EventSubscription) -> None:
+        """Stop queueing events for subscription."""
+        self.subscriptions.remove(subscription)
+
+    def publish(self, event: ChangeEvent) -> None:
+        """Queue event for every subscriber."""
+        for subscription in self.subscriptions:
+            subscription.put(event)
+
+    @contextmanager
+    def watch(self, entities: Iterable[Any]) -> Iterator[None]:
+        """Publish changes to WATCHED_FIELDS of entities made inside the block.
+
+        Nothing is compared while there are no subscribers, and nothing is
+        published if the block raises.
+        """
+        if not self.subscriptions:
+            yield
+            return
+        entities = list(entities)
+        before = [_fields(entity) for entity in entities]
+        yield
+        timestamp = time.time()
+        for entity, old_fields in zip(entities, before):
+            for field, new in _fields(entity).items():
+                old = old_fields.get(field)
+                if old != new:
+                    self.publish(ChangeEvent(entity.bed_id, entity, field, old, new, timestamp))
+
+
+def _fields(entity: Any) -> dict[str, Any]:
+    """Return the current values of an entity's watched fields."""
+    return {field: getattr(entity, field) for field in WATCHED_FIELDS if hasattr(entity, field)}
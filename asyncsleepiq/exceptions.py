@@ -16,3 +16,10 @@ class SleepIQAPIException(Exception):
         self.code = code
         self.message = message
         super().__init__(message)
+
+
+class SleepIQCircuitOpenException(SleepIQAPIException):
+    """API calls to a host are failing fast after repeated errors."""
+
+    def __init__(self, host):
+        super().__init__(None, f"Circuit breaker open for {host}, failing fast")
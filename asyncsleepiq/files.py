@@ -0,0 +1,29 @@
+"""JSON state files for SleepIQ API."""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from typing import Any
+
+
+def read_json_file(path: str | os.PathLike[str]) -> dict[str, Any] | None:
+    """Read a JSON object from a file, None if it's missing or unreadable."""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def write_json_file(path: str | os.PathLike[str], data: dict[str, Any]) -> None:
+    """Atomically replace a file with data as compact JSON, readable only by the owner."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -1,12 +1,14 @@
 """Foundation object from SleepIQ API."""
 from __future__ import annotations
 
+import asyncio
 from typing import Any
 
 from .actuator import SleepIQActuator
-from .api import SleepIQAPI
+from .api import SleepIQAPI, gather_limited
 from .consts import (
     BED_LIGHTS,
+    FOUNDATION_CONCURRENCY,
     FOUNDATION_TYPES,
     End,
     Mode,
@@ -22,10 +24,11 @@ from .core_climate import SleepIQCoreClimate
 class SleepIQFoundation:
     """Foundation object from SleepIQ API."""
 
-    def __init__(self, api: SleepIQAPI, bed_id: str) -> None:
+    def __init__(self, api: SleepIQAPI, bed_id: str, mac_addr: str = "") -> None:
         """Initialize foundation object."""
         self._api = api
         self.bed_id = bed_id
+        self.mac_addr = mac_addr
         self.lights: list[SleepIQLight] = []
         self.foot_warmers: list[SleepIQFootWarmer] = []
         self.core_climates: list[SleepIQCoreClimate] = []
@@ -41,6 +44,9 @@ class SleepIQFoundation:
         self.type = ""
         self.actuators: list[SleepIQActuator] = []
         self.presets: list[SleepIQPreset] = []
+        self.is_moving = False  # reported by foundation/status, classic foundations only
+        self.initialized = False
+        self._init_lock = asyncio.Lock()
 
     def __str__(self) -> str:
         """Return string representation."""
@@ -50,6 +56,28 @@ class SleepIQFoundation:
         """Return string representation."""
         return f"SleepIQFoundation[{self.type}](lights: {len(self.lights)}, features: {len(self.features)}, actuators: {len(self.actuators)}, presets: {len(self.presets)})"
 
+    @property
+    def entities(self) -> list[Any]:
+        """Return lights, actuators, presets, foot warmers and core climates."""
+        return [*self.lights, *self.actuators, *self.presets, *self.foot_warmers, *self.core_climates]
+
+    async def ensure_initialized(self) -> None:
+        """Discover features, lights, actuators, presets and warmers if not done yet.
+
+        Used by beds set up with init_beds(lazy=True), concurrent callers
+        share a single discovery. A discovery that failed part way is
+        started over from empty lists by the next call.
+        """
+        if self.initialized:
+            return
+        async with self._init_lock:
+            if not self.initialized:
+                self.lights, self.foot_warmers, self.core_climates = [], [], []
+                self.actuators, self.presets = [], []
+                await self.fetch_features()
+                await self.init_features()
+                self.initialized = True
+
     async def init_features(self) -> None:
         """Initialize all foundation features."""
         await self.init_lights()
@@ -59,21 +87,36 @@ class SleepIQFoundation:
             return
 
         data = await self._api.get(f"bed/{self.bed_id}/foundation/status")
+        self.is_moving = bool(data.get("fsIsMoving", False))
         await self.init_actuators(data)
         await self.init_presets(data)
 
-    async def update_foundation_status(self) -> None:
-        """Update all foundation data from API."""
-        await self.update_lights()
-        await self.update_foot_warmers()
-
-        if not self.type:
-            return
-
-        data = await self._api.get(f"bed/{self.bed_id}/foundation/status")
-
-        await self.update_actuators(data)
-        await self.update_presets(data)
+    async def update_foundation_status(self, concurrency: int = FOUNDATION_CONCURRENCY) -> None:
+        """Update all foundation data from API.
+
+        All reads are issued together, up to concurrency at a time, and the
+        results are only applied once every read has succeeded.
+        """
+        await self.ensure_initialized()
+        requests = [light.fetch_state() for light in self.lights]
+        if self.features["hasFootWarming"]:
+            requests.append(self._api.get(f"bed/{self.bed_id}/foundation/footwarming"))
+        if self.type:
+            requests.append(self._api.get(f"bed/{self.bed_id}/foundation/status"))
+        results = await gather_limited(concurrency, *requests)
+
+        with self._api.event_bus.watch(self.entities):
+            for light in self.lights:
+                light.apply_state(results.pop(0))
+            if self.features["hasFootWarming"]:
+                data = results.pop(0)
+                for foot_warmer in self.foot_warmers:
+                    await foot_warmer.update(data)
+            if self.type:
+                data = results.pop(0)
+                self.is_moving = bool(data.get("fsIsMoving", False))
+                await self.update_actuators(data)
+                await self.update_presets(data)
 
     async def init_foot_warmers(self) -> None:
         if not self.features["hasFootWarming"]:
@@ -92,11 +135,16 @@ class SleepIQFoundation:
 
     async def init_lights(self) -> None:
         """Initialize list of lights available on foundation."""
-        for light in BED_LIGHTS:
-            exists = await self._api.check(f"bed/{self.bed_id}/foundation/outlet", params={"outletId": light})
-            if exists:
-                self.lights.append(SleepIQLight(self._api, self.bed_id, light))
-        await self.update_lights()
+        probes = await gather_limited(
+            FOUNDATION_CONCURRENCY,
+            *(self._api.probe(f"bed/{self.bed_id}/foundation/outlet", params={"outletId": light}) for light in BED_LIGHTS),
+        )
+        for light_id, (status, state) in zip(BED_LIGHTS, probes):
+            if status == 200:
+                light = SleepIQLight(self._api, self.bed_id, light_id)
+                if state is not None:
+                    light.apply_state(state)
+                self.lights.append(light)
 
     async def update_lights(self) -> None:
         """Update light states from API."""
@@ -152,12 +200,12 @@ class SleepIQFoundation:
 
     async def fetch_features(self) -> None:
         """Update list of features available for foundation from API."""
-        have_foundation = await self._api.check("bed/" + self.bed_id + "/foundation/system")
-        if not have_foundation:
+        status, fs = await self._api.probe("bed/" + self.bed_id + "/foundation/system")
+        if status != 200:
             self.type = ""
             return
 
-        fs = await self._api.get("bed/" + self.bed_id + "/foundation/system")
+        fs = fs or {}
         features_flags = fs.get("fsBoardFeatures", 0)
         self.features["boardIsASingle"] = bool(features_flags & (1 << 0))
         self.features["hasMassageAndLight"] = bool(features_flags & (1 << 1))
@@ -182,6 +230,8 @@ class SleepIQFoundation:
         """Stop motion on L or R side of bed."""
         data = {"footMotion": 1, "headMotion": 1, "massageMotion": 1, "side": side}
         await self._api.put("bed/" + self.bed_id + "/foundation/motion", data)
+        for actuator in self.actuators:
+            actuator.target = None
 
     async def set_foundation_massage(
         self, side: str, foot_speed: Speed, head_speed: Speed, timer: int = 0, mode: Mode = Mode.OFF
@@ -9,17 +9,25 @@ from ..actuator import SleepIQActuator
 class SleepIQFuzionActuator(SleepIQActuator):
     """Actuator representation for SleepIQ API."""
 
-    async def set_position(self, position: int, slow_speed: bool = False) -> None:
-        """Set the position of an actuator through the API."""
-        if position < 0 or position > 100:
-            raise ValueError("Invalid position, must be between 0 and 100")
+    async def _send_position(self, position: int, slow_speed: bool) -> None:
+        """Send a target position to the API."""
         if position == self.position:
             return
         args = [self.side_full.lower(), self.actuator_full.lower(), str(position)]
         await self._api.bamkey(self.bed_id, "SetActuatorTargetPosition", args)
+        self._set_target(position)
 
     async def update(self, data: dict[str, Any]) -> None:
         """Update the position of an actuator from the API."""
+        self.apply_state(await self.fetch_state())
+
+    async def fetch_state(self) -> str:
+        """Fetch the position of an actuator from the API without applying it."""
         args = [self.side_full.lower(), self.actuator_full.lower()]
-        result = await self._api.bamkey(self.bed_id, "GetActuatorPosition", args)
-        self.position = int(result)
+        return await self._api.bamkey(self.bed_id, "GetActuatorPosition", args)
+
+    def apply_state(self, state: str) -> None:
+        """Apply the actuator position fetched from the API."""
+        self.position = int(state)
+        if self.position == self.target:
+            self.target = None
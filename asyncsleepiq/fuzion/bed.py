@@ -5,6 +5,7 @@ from typing import Any
 
 from ..api import SleepIQAPI
 from ..consts import SIDES_FULL, Side
+from ..exceptions import SleepIQCircuitOpenException
 from ..foundation import SleepIQFoundation
 from .foundation import SleepIQFuzionFoundation
 from ..sleeper import SleepIQSleeper
@@ -23,14 +24,18 @@ class SleepIQFuzionBed(SleepIQBed):
             for side in [Side.LEFT, Side.RIGHT]
             if data.get(f"sleeper{SIDES_FULL[side]}Id")
         ]
-        self.foundation: SleepIQFoundation = SleepIQFuzionFoundation(api, self.id)
+        self.foundation: SleepIQFoundation = SleepIQFuzionFoundation(api, self.id, self.mac_addr)
 
     async def valid(self) -> bool:
+        """Return true if the bed responds, updating paused from the same request."""
         try:
-            await self._api.bamkey(self.id, "GetSleepiqPrivacyState")
-            return True
+            status = await self._api.bamkey(self.id, "GetSleepiqPrivacyState")
+        except SleepIQCircuitOpenException:
+            raise
         except:
             return False
+        self.paused = status == "paused"
+        return True
 
     async def stop_pump(self) -> None:
         """Stop pump."""
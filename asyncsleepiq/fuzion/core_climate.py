@@ -30,9 +30,16 @@ class SleepIQFuzionCoreClimate(SleepIQCoreClimate):
 
     async def update(self, data: dict[str, Any]) -> None:
         """Update the core climate data through the API."""
+        self.apply_state(await self.fetch_state())
+
+    async def fetch_state(self) -> str:
+        """Fetch the core climate data from the API without applying it."""
         args = [SIDES_FULL[self.side].lower()]
-        data = await self._api.bamkey(self.bed_id, "GetHeidiMode", args)
-        data = data.split()
+        return await self._api.bamkey(self.bed_id, "GetHeidiMode", args)
+
+    def apply_state(self, state: str) -> None:
+        """Apply core climate data fetched from the API."""
+        data = state.split()
         self.temperature = CoreTemps[data[0].upper()]
         self.is_on = self.temperature > 0
         self.timer = int(data[1]) if self.is_on else 0
@@ -50,12 +57,8 @@ class SleepIQFuzionClimateCoolCoreClimate(SleepIQFuzionCoreClimate):
         await self._api.bamkey(self.bed_id, "SetClimateMode", args)
         await self.update({})
 
-    async def update(self, data: dict[str, Any]) -> None:
-        """Update the core climate data through the API."""
+    async def fetch_state(self) -> str:
+        """Fetch the core climate data from the API without applying it."""
         args = [SIDES_FULL[self.side].lower()]
-        data = await self._api.bamkey(self.bed_id, "GetClimateMode", args)
-        data = data.split()
-        self.temperature = CoreTemps[data[0].upper()]
-        self.is_on = self.temperature > 0
-        self.timer = int(data[1]) if self.is_on else 0
+        return await self._api.bamkey(self.bed_id, "GetClimateMode", args)
 
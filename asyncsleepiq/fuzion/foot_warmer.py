@@ -23,9 +23,16 @@ class SleepIQFuzionFootWarmer(SleepIQFootWarmer):
 
     async def update(self, data: dict[str, Any]) -> None:
         """Update the foot warmer through the API."""
+        self.apply_state(await self.fetch_state())
+
+    async def fetch_state(self) -> str:
+        """Fetch the foot warmer settings from the API without applying them."""
         args = [SIDES_FULL[self.side].lower()]
-        data = await self._api.bamkey(self.bed_id, "GetFootwarmingSettings", args)
-        data = data.split()
+        return await self._api.bamkey(self.bed_id, "GetFootwarmingSettings", args)
+
+    def apply_state(self, state: str) -> None:
+        """Apply foot warmer settings fetched from the API."""
+        data = state.split()
         self.temperature = FootWarmingTemps[data[0].upper()]
         self.is_on = self.temperature > 0
         self.timer = int(data[1]) if self.is_on else 0
@@ -3,9 +3,10 @@ from __future__ import annotations
 
 from typing import Any
 
-from ..api import SleepIQAPI
+from ..api import SleepIQAPI, gather_limited
 
 from ..consts import (
+    FOUNDATION_CONCURRENCY,
     NO_PRESET,
     PRESET_FAV,
     PRESET_FLAT,
@@ -58,14 +59,22 @@ class SleepIQFuzionFoundation(SleepIQFoundation):
         await self.init_presets({})
         await self.init_foot_warmers()
         await self.init_core_climates()
-
-    async def update_foundation_status(self) -> None:
-        """Update all foundation data from API."""
-        await self.update_lights()
-        await self.update_actuators({})
-        await self.update_presets({})
-        await self.update_foot_warmers()
-        await self.update_core_climates()
+        if self._api.capability_cache is not None:
+            await self._api.capability_cache.save()
+
+    async def update_foundation_status(self, concurrency: int = FOUNDATION_CONCURRENCY) -> None:
+        """Update all foundation data from API.
+
+        Every entity is read with its own bamkey call, so the calls are
+        issued together, up to concurrency at a time, and the results are
+        only applied once every call has succeeded.
+        """
+        await self.ensure_initialized()
+        entities = self.entities
+        states = await gather_limited(concurrency, *(entity.fetch_state() for entity in entities))
+        with self._api.event_bus.watch(entities):
+            for entity, state in zip(entities, states):
+                entity.apply_state(state)
 
     async def init_lights(self) -> None:
         """Initialize list of lights available on foundation."""
@@ -113,7 +122,7 @@ class SleepIQFuzionFoundation(SleepIQFoundation):
     async def init_foot_warmers(self) -> None:
         """Initialize list of foot warmers available on foundation."""
         for side in [Side.LEFT, Side.RIGHT]:
-            result = await self._api.bamkey(self.bed_id, "GetFootwarmingPresence", args=[SIDES_FULL[side].lower()])
+            result = await self.__capability("GetFootwarmingPresence", [SIDES_FULL[side].lower()])
             if result == "1":
                 self.foot_warmers.append(SleepIQFuzionFootWarmer(self._api, self.bed_id, side, 0, 0))
 
@@ -128,17 +137,13 @@ class SleepIQFuzionFoundation(SleepIQFoundation):
         """Initialize list of core climates available on foundation."""
 
         for side in [Side.LEFT, Side.RIGHT]:
-            heidi = await self._api.bamkey(
-                self.bed_id, "GetHeidiPresence", args=[SIDES_FULL[side].lower()]
-            )
+            heidi = await self.__capability("GetHeidiPresence", [SIDES_FULL[side].lower()])
             if heidi in ("true", "1"):
                 self.core_climates.append(
                     SleepIQFuzionCoreClimate(self._api, self.bed_id, side, 0, 0)
                 )
 
-            climate = await self._api.bamkey(
-                self.bed_id, "GetClimatePresence", args=[SIDES_FULL[side].lower()]
-            )
+            climate = await self.__capability("GetClimatePresence", [SIDES_FULL[side].lower()])
             if climate in ("true", "1"):
                 self.core_climates.append(
                     SleepIQFuzionClimateCoolCoreClimate(
@@ -155,7 +160,7 @@ class SleepIQFuzionFoundation(SleepIQFoundation):
 
     async def fetch_features(self) -> None:
         """Update list of features available for foundation from API."""
-        vals = await self._api.bamkey(self.bed_id, "GetSystemConfiguration")
+        vals = await self.__capability("GetSystemConfiguration")
         for k, v in zip(FEATURE_NAMES, vals.split()):
             if v == "no":
                 v = False
@@ -163,9 +168,24 @@ class SleepIQFuzionFoundation(SleepIQFoundation):
                 v = True
             self.features[k] = v
 
+    async def __capability(self, key: str, args: list[str] = []) -> str:
+        """Return the answer of a capability query, from the capability cache if possible."""
+        cache = self._api.capability_cache
+        query = " ".join([key, *args])
+        if cache is not None:
+            cached = await cache.get(self.bed_id, self.mac_addr, query)
+            if cached is not None:
+                return cached
+        result = await self._api.bamkey(self.bed_id, key, args)
+        if cache is not None:
+            await cache.set(self.bed_id, self.mac_addr, query, result)
+        return result
+
     async def stop_motion(self, side: str) -> None:
         """Stop motion on L or R side of bed."""
         await self._api.bamkey(self.bed_id, "HaltAllActuators")
+        for actuator in self.actuators:
+            actuator.target = None
 
     async def set_foundation_massage(
         self, side: str, foot_speed: Speed, head_speed: Speed, timer: int = 0, mode: Mode = Mode.OFF
@@ -1,6 +1,8 @@
 """Light representation for SleepIQ API."""
 from __future__ import annotations
 
+from typing import Any
+
 from ..light import SleepIQLight
 
 
@@ -22,8 +24,11 @@ class SleepIQFuzionLight(SleepIQLight):
         arg = "high" if setting else "off"
         await self._api.bamkey(self.bed_id, "SetUnderbedLightSettings", args=[arg, "0"])
 
-    async def update(self) -> None:
-        """Update light state from API."""
-        result = await self._api.bamkey(self.bed_id, "GetUnderbedLightSettings")
-        state, num = result.split()
-        self.is_on = state != "off"
+    async def fetch_state(self) -> Any:
+        """Fetch light state from API without applying it."""
+        return await self._api.bamkey(self.bed_id, "GetUnderbedLightSettings")
+
+    def apply_state(self, state: Any) -> None:
+        """Apply light state fetched from API."""
+        setting, num = state.split()
+        self.is_on = setting != "off"
@@ -45,5 +45,13 @@ class SleepIQFuzionPreset(SleepIQPreset):
 
     async def update(self, data: dict[str, Any]) -> None:
         """Update the position of an actuator from the API."""
+        self.apply_state(await self.fetch_state())
+
+    async def fetch_state(self) -> str:
+        """Fetch the current preset from the API without applying it."""
         args = [self.side_full.lower()]
-        self.preset = await self._api.bamkey(self.bed_id, "GetCurrentPreset", args)
+        return await self._api.bamkey(self.bed_id, "GetCurrentPreset", args)
+
+    def apply_state(self, state: str) -> None:
+        """Apply the current preset fetched from the API."""
+        self.preset = state
@@ -12,11 +12,8 @@ class SleepIQFuzionSleeper(SleepIQSleeper):
         """Updates sleeper with latest data."""
         await self.fetch_sleepnumber()
 
-    async def set_sleepnumber(self, setting: int) -> None:
-        """Set sleep number 5-100 (multiple of 5)."""
-        if 0 > setting or setting > 100:
-            raise ValueError("Invalid SleepNumber, must be between 0 and 100")
-        setting = int(round(setting / 5)) * 5
+    async def _send_sleepnumber(self, setting: int) -> None:
+        """Send a sleep number setting to the API."""
         args = [SIDES_FULL[self.side].lower(), str(setting)]
         await self.api.bamkey(self.bed_id, "StartSleepNumberAdjustment", args=args)
 
@@ -25,6 +22,7 @@ class SleepIQFuzionSleeper(SleepIQSleeper):
         args = [SIDES_FULL[self.side].lower()]
         result = await self.api.bamkey(self.bed_id, "GetSleepNumberControls", args=args)
         is_updating, ambient_number, user_number = result.split()
+        self.is_updating = is_updating in ("1", "true", "yes")
         self.sleep_number = int(user_number)
 
     async def set_favsleepnumber(self, setting: int) -> None:
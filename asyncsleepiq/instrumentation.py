@@ -0,0 +1,135 @@
+"""Request instrumentation for SleepIQ API."""
+from __future__ import annotations
+
+import bisect
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+import logging
+from typing import Any
+
+from .consts import LATENCY_BUCKETS
+
+_LOGGER = logging.getLogger("ASyncSleepIQ")
+
+
+@dataclass
+class RequestRecord:
+    """A single API request, including any retries."""
+
+    method: str
+    endpoint: str               # url template, e.g. "bed/{id}/foundation/status"
+    command: str | None = None  # bamkey command name
+    status: int | None = None   # last HTTP status, None if no response
+    retries: int = 0
+    bytes: int = 0              # response body size
+    duration: float = 0.0       # wall time in seconds
+    error: str | None = None    # exception class name if the request failed
+
+    @property
+    def name(self) -> str:
+        """Return the name requests are grouped by in statistics."""
+        return f"bamkey:{self.command}" if self.command else f"{self.method} {self.endpoint}"
+
+
+class LatencyHistogram:
+    """Histogram of request latencies with fixed buckets (seconds)."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        """Initialize histogram."""
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def __str__(self) -> str:
+        """Return string representation."""
+        return f"LatencyHistogram(count={self.count}, mean={self.mean:.3f}, p95={self.percentile(95):.3f})"
+
+    __repr__ = __str__
+
+    @property
+    def mean(self) -> float:
+        """Return mean latency."""
+        return self.total / self.count if self.count else 0.0
+
+    def observe(self, value: float) -> None:
+        """Add a latency."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> float:
+        """Return the upper bound of the bucket holding the q-th percentile, at most max."""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(self.buckets[i], self.max) if i < len(self.buckets) else self.max
+        return self.max
+
+
+class Instrumentation:
+    """Collects a RequestRecord for every API request.
+
+    Records are passed to every sink and summarized in per-request-name
+    latency histograms and status counters that can be queried at runtime.
+    """
+
+    def __init__(self) -> None:
+        """Initialize instrumentation."""
+        self.sinks: list[Callable[[RequestRecord], None]] = []
+        self.histograms: dict[str, LatencyHistogram] = {}
+        self.counters: Counter[tuple[str, str]] = Counter()
+
+    def __str__(self) -> str:
+        """Return string representation."""
+        return f"Instrumentation(requests={sum(h.count for h in self.histograms.values())}, sinks={len(self.sinks)})"
+
+    __repr__ = __str__
+
+    def add_sink(self, sink: Callable[[RequestRecord], None]) -> None:
+        """Call sink with every request record."""
+        self.sinks.append(sink)
+
+    def remove_sink(self, sink: Callable[[RequestRecord], None]) -> None:
+        """Stop calling sink."""
+        self.sinks.remove(sink)
+
+    def record(self, record: RequestRecord) -> None:
+        """Add a finished request."""
+        name = record.name
+        if name not in self.histograms:
+            self.histograms[name] = LatencyHistogram()
+        self.histograms[name].observe(record.duration)
+        self.counters[(name, record.error or str(record.status))] += 1
+        for sink in self.sinks:
+            try:
+                sink(record)
+            except Exception:
+                _LOGGER.exception("Request instrumentation sink failed")
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Return count, latency and outcome summary by request name, slowest first."""
+        stats = {
+            name: {
+                "count": histogram.count,
+                "mean": histogram.mean,
+                "p50": histogram.percentile(50),
+                "p95": histogram.percentile(95),
+                "max": histogram.max,
+                "outcomes": {outcome: n for (key, outcome), n in self.counters.items() if key == name},
+            }
+            for name, histogram in self.histograms.items()
+        }
+        return dict(sorted(stats.items(), key=lambda item: -item[1]["mean"]))
+
+    def reset(self) -> None:
+        """Clear histograms and counters."""
+        self.histograms.clear()
+        self.counters.clear()
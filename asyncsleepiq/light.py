@@ -1,6 +1,8 @@
 """Light representation for SleepIQ API."""
 from __future__ import annotations
 
+from typing import Any
+
 from .api import SleepIQAPI
 
 
@@ -39,8 +41,15 @@ class SleepIQLight:
 
     async def update(self) -> None:
         """Update light state from API."""
+        self.apply_state(await self.fetch_state())
+
+    async def fetch_state(self) -> Any:
+        """Fetch light state from API without applying it."""
         params = {"outletId": self.outlet_id}
-        status = await self._api.get(
+        return await self._api.get(
             f"bed/{self.bed_id}/foundation/outlet", params=params
         )
-        self.is_on = status["setting"] == 1
+
+    def apply_state(self, state: Any) -> None:
+        """Apply light state fetched from API."""
+        self.is_on = state["setting"] == 1
@@ -0,0 +1,89 @@
+"""Client side rate limiting for SleepIQ API."""
+from __future__ import annotations
+
+import asyncio
+import time
+from weakref import WeakKeyDictionary
+
+from aiohttp import ClientSession
+
+from .consts import READ_BURST, READ_RATE, WRITE_BURST, WRITE_RATE
+
+
+class TokenBucket:
+    """Token bucket allowing rate requests per second with bursts up to burst.
+
+    Requests over budget wait for a token in arrival order instead of failing.
+    """
+
+    def __init__(self, rate: float, burst: float) -> None:
+        """Initialize token bucket."""
+        self.rate = rate
+        self.burst = burst
+        self.delayed = 0
+        self.wait_time = 0.0
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def __str__(self) -> str:
+        """Return string representation."""
+        return f"TokenBucket(rate={self.rate}/s, burst={self.burst}, delayed={self.delayed})"
+
+    __repr__ = __str__
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                wait = (1 - self._tokens) / self.rate
+                self.delayed += 1
+                self.wait_time += wait
+                await asyncio.sleep(wait)
+                self._refill()
+            self._tokens -= 1
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class RateLimiter:
+    """Rate limiter with separate read and write budgets.
+
+    A single instance can be passed to many AsyncSleepIQ objects, or use
+    for_session to get the limiter shared by every client on a ClientSession.
+    """
+
+    _shared: WeakKeyDictionary[ClientSession, RateLimiter] = WeakKeyDictionary()
+
+    def __init__(
+        self,
+        read_rate: float = READ_RATE,
+        read_burst: float = READ_BURST,
+        write_rate: float = WRITE_RATE,
+        write_burst: float = WRITE_BURST,
+    ) -> None:
+        """Initialize rate limiter."""
+        self.reads = TokenBucket(read_rate, read_burst)
+        self.writes = TokenBucket(write_rate, write_burst)
+
+    def __str__(self) -> str:
+        """Return string representation."""
+        return f"RateLimiter(reads={self.reads}, writes={self.writes})"
+
+    __repr__ = __str__
+
+    @classmethod
+    def for_session(cls, session: ClientSession) -> RateLimiter:
+        """Return the rate limiter shared by every client using session."""
+        if session not in cls._shared:
+            cls._shared[session] = cls()
+        return cls._shared[session]
+
+    async def acquire(self, write: bool = False) -> None:
+        """Wait for budget to make a read or write request."""
+        await (self.writes if write else self.reads).acquire()
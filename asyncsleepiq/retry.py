@@ -0,0 +1,102 @@
+"""Retry policy and circuit breaker for SleepIQ API."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import random
+import time
+from weakref import WeakKeyDictionary
+
+from aiohttp import ClientSession
+
+
+@dataclass
+class RetryPolicy:
+    """Retry settings for idempotent API reads.
+
+    Failed reads (timeouts and retry_statuses responses) are retried with
+    exponential backoff and full jitter until max_attempts or max_elapsed
+    seconds is reached. After breaker_threshold consecutive failures to a
+    host, requests to it fail fast for breaker_reset seconds.
+    """
+
+    max_attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    max_elapsed: float = 30.0
+    retry_statuses: tuple[int, ...] = (429, 500, 502, 503, 504)
+    breaker_threshold: int = 5  # 0 disables the circuit breaker
+    breaker_reset: float = 30.0
+
+    def delay(self, attempt: int) -> float:
+        """Return the delay before retrying after the given (1-based) attempt."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """Circuit breaker for a single host.
+
+    Opens after threshold consecutive failures, then lets one trial request
+    through after reset_timeout seconds and closes again if it succeeds.
+    A single instance can be passed to many AsyncSleepIQ objects, or use
+    for_session to get the breaker shared by every client on a ClientSession.
+    """
+
+    _shared: WeakKeyDictionary[ClientSession, dict[str, CircuitBreaker]] = WeakKeyDictionary()
+
+    def __init__(self, threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        """Initialize circuit breaker."""
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._trial_at: float | None = None
+
+    def __str__(self) -> str:
+        """Return string representation."""
+        return f"CircuitBreaker[{self.state}](failures={self.failures})"
+
+    __repr__ = __str__
+
+    @classmethod
+    def for_session(
+        cls, session: ClientSession, host: str, threshold: int = 5, reset_timeout: float = 30.0
+    ) -> CircuitBreaker:
+        """Return the circuit breaker for host shared by every client using session."""
+        breakers = cls._shared.setdefault(session, {})
+        if host not in breakers:
+            breakers[host] = cls(threshold, reset_timeout)
+        return breakers[host]
+
+    @property
+    def state(self) -> str:
+        """Return "closed", "open" or "half-open"."""
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return "open"
+        return "half-open"
+
+    def allow(self) -> bool:
+        """Return true if a request may be made now."""
+        state = self.state
+        if state == "closed":
+            return True
+        # a trial that never reported back (e.g. cancelled) expires like the breaker
+        now = time.monotonic()
+        if state == "half-open" and (self._trial_at is None or now - self._trial_at >= self.reset_timeout):
+            self._trial_at = now
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful request."""
+        self.failures = 0
+        self._opened_at = None
+        self._trial_at = None
+
+    def record_failure(self) -> None:
+        """Count a failed request, opening the breaker at the threshold."""
+        self.failures += 1
+        if self._trial_at is not None or (self.threshold and self.failures >= self.threshold):
+            self._opened_at = time.monotonic()
+        self._trial_at = None
@@ -0,0 +1,240 @@
+"""Adaptive polling of SleepIQ beds."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+import logging
+import time
+from typing import Any
+
+from .asyncsleepiq import AsyncSleepIQ
+from .instrumentation import RequestRecord
+
+_LOGGER = logging.getLogger("ASyncSleepIQ")
+
+
+@dataclass
+class PollingPolicy:
+    """Poll interval settings for PollingScheduler (seconds).
+
+    Entities are polled every fast_interval while something is in motion or
+    an occupancy change is recent, every base_interval after a change, and
+    back off by backoff per unchanged poll up to max_interval. All
+    intervals are stretched, up to max_stretch times, when the mean latency
+    of recent requests exceeds latency_target or requests fail.
+    """
+
+    fast_interval: float = 2.0
+    base_interval: float = 30.0
+    max_interval: float = 300.0
+    backoff: float = 1.5
+    in_bed_hold: float = 60.0  # seconds to poll fast after in_bed changes
+    motion_timeout: float = 60.0  # seconds to poll fast for an actuator that hasn't reached its target
+    latency_target: float = 1.0
+    max_stretch: float = 8.0
+    window: int = 50  # number of recent requests used for latency/error rate
+
+    def next_interval(self, interval: float, active: bool, changed: bool) -> float:
+        """Return the next unstretched interval after a poll."""
+        if active:
+            return self.fast_interval
+        if changed:
+            return self.base_interval
+        return min(self.max_interval, max(self.base_interval, interval * self.backoff))
+
+
+class _PollJob:
+    """A single entity polled at its own rate."""
+
+    def __init__(
+        self,
+        name: str,
+        poll: Callable[[], Awaitable[None]],
+        snapshot: Callable[[], Hashable],
+        active: Callable[[], bool],
+        interval: float,
+    ) -> None:
+        self.name = name
+        self.poll = poll
+        self.snapshot = snapshot
+        self.active = active
+        self.interval = interval
+        self.wake = asyncio.Event()
+        self.task: asyncio.Task[None] | None = None
+
+
+class PollingScheduler:
+    """Polls occupancy and each bed's foundation at adaptive rates.
+
+    Occupancy (fetch_bed_statuses) is one job for the account and every
+    bed's update_foundation_status is a job of its own, so a moving bed is
+    polled quickly without polling idle ones more often. Beds added to or
+    removed from the API (e.g. by revalidate_topology) get their jobs
+    added or removed after the next occupancy poll.
+    """
+
+    def __init__(self, api: AsyncSleepIQ, policy: PollingPolicy | None = None) -> None:
+        """Initialize scheduler."""
+        self._api = api
+        self.policy = policy or PollingPolicy()
+        self.jobs: dict[str, _PollJob] = {}
+        self._recent: deque[tuple[float, bool]] = deque(maxlen=self.policy.window)
+        self._in_bed: tuple[bool, ...] | None = None
+        self._in_bed_changed: float | None = None
+
+    def __str__(self) -> str:
+        """Return string representation."""
+        intervals = ", ".join(f"{name}={job.interval:.1f}s" for name, job in self.jobs.items())
+        return f"PollingScheduler({intervals})"
+
+    __repr__ = __str__
+
+    async def __aenter__(self) -> PollingScheduler:
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.stop()
+
+    @property
+    def stretch(self) -> float:
+        """Return the factor intervals are stretched by for recent API latency and errors."""
+        if not self._recent:
+            return 1.0
+        latency = sum(duration for duration, _ in self._recent) / len(self._recent)
+        error_rate = sum(failed for _, failed in self._recent) / len(self._recent)
+        stretch = max(1.0, latency / self.policy.latency_target) * (1 + 4 * error_rate)
+        return min(self.policy.max_stretch, stretch)
+
+    def start(self) -> None:
+        """Start polling every bed known to the API."""
+        if self.jobs:
+            return
+        self._api.instrumentation.add_sink(self.__observe)
+        self.__add_job(_PollJob("status", self.__poll_status, self.__status_snapshot, self.__status_active, 0))
+        self.__sync_jobs()
+
+    async def stop(self) -> None:
+        """Stop polling."""
+        tasks = [job.task for job in self.jobs.values() if job.task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self.jobs:
+            self._api.instrumentation.remove_sink(self.__observe)
+        self.jobs.clear()
+
+    def poll_now(self, bed_id: str | None = None) -> None:
+        """Poll occupancy, and the foundation of bed_id or every bed, right away.
+
+        Call after sending a command so its effect is picked up at the fast
+        interval instead of after a backed off one.
+        """
+        for name, job in self.jobs.items():
+            if name == "status" or bed_id is None or name == f"foundation:{bed_id}":
+                job.interval = self.policy.fast_interval
+                job.wake.set()
+
+    def __add_job(self, job: _PollJob) -> None:
+        self.jobs[job.name] = job
+        job.task = asyncio.create_task(self.__run(job))
+
+    def __sync_jobs(self) -> None:
+        """Add foundation jobs for new beds and remove those of beds that are gone."""
+        names = {f"foundation:{bed_id}": bed_id for bed_id in self._api.beds}
+        for name in [name for name in self.jobs if name != "status" and name not in names]:
+            task = self.jobs.pop(name).task
+            if task:
+                task.cancel()
+        for name, bed_id in names.items():
+            if name not in self.jobs:
+                self.__add_job(self.__foundation_job(bed_id))
+
+    async def __poll_status(self) -> None:
+        await self._api.fetch_bed_statuses()
+        self.__sync_jobs()
+
+    def __foundation_job(self, bed_id: str) -> _PollJob:
+        """Return the job polling a bed's foundation.
+
+        The bed is looked up on every poll, as revalidate_topology replaces
+        bed objects. The foundation is considered moving while the API says
+        so (classic fsIsMoving), while an actuator hasn't reached the target
+        last sent to it (up to motion_timeout) or its position changed
+        between polls.
+        """
+        positions: list[tuple[int, ...]] = []
+
+        async def poll() -> None:
+            bed = self._api.beds.get(bed_id)
+            if bed is not None:
+                await bed.foundation.update_foundation_status()
+
+        def snapshot() -> Hashable:
+            bed = self._api.beds.get(bed_id)
+            if bed is None:
+                return None
+            foundation = bed.foundation
+            positions.append(tuple(actuator.position for actuator in foundation.actuators))
+            del positions[:-2]
+            return (
+                positions[-1],
+                tuple(preset.preset for preset in foundation.presets),
+                tuple(light.is_on for light in foundation.lights),
+                tuple((w.is_on, w.temperature) for w in foundation.foot_warmers),
+                tuple((c.is_on, c.temperature) for c in foundation.core_climates),
+            )
+
+        def active() -> bool:
+            bed = self._api.beds.get(bed_id)
+            if bed is None:
+                return False
+            if bed.foundation.is_moving:
+                return True
+            now = time.monotonic()
+            for actuator in bed.foundation.actuators:
+                if actuator.target is not None and now - actuator.target_time < self.policy.motion_timeout:
+                    return True
+            return len(positions) == 2 and positions[0] != positions[1]
+
+        return _PollJob(f"foundation:{bed_id}", poll, snapshot, active, 0)
+
+    def __status_snapshot(self) -> Hashable:
+        sleepers = [sleeper for bed in self._api.beds.values() for sleeper in bed.sleepers]
+        in_bed = tuple(sleeper.in_bed for sleeper in sleepers)
+        if self._in_bed is not None and in_bed != self._in_bed:
+            self._in_bed_changed = time.monotonic()
+        self._in_bed = in_bed
+        return in_bed, tuple(sleeper.sleep_number for sleeper in sleepers)
+
+    def __status_active(self) -> bool:
+        sleepers = [sleeper for bed in self._api.beds.values() for sleeper in bed.sleepers]
+        if any(sleeper.is_updating for sleeper in sleepers):
+            return True
+        return self._in_bed_changed is not None and time.monotonic() - self._in_bed_changed < self.policy.in_bed_hold
+
+    def __observe(self, record: RequestRecord) -> None:
+        failed = record.error is not None or (record.status or 0) >= 429
+        self._recent.append((record.duration, failed))
+
+    async def __run(self, job: _PollJob) -> None:
+        """Poll job until cancelled."""
+        before: Hashable | None = None
+        while True:
+            job.wake.clear()
+            try:
+                await job.poll()
+            except Exception:
+                _LOGGER.exception(f"Polling {job.name} failed")
+                changed = active = False
+            else:
+                after = job.snapshot()
+                changed = before is not None and after != before
+                active, before = job.active(), after
+            job.interval = self.policy.next_interval(job.interval, active, changed)
+            try:
+                await asyncio.wait_for(job.wake.wait(), job.interval * self.stretch)
+            except asyncio.TimeoutError:
+                pass
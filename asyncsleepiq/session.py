@@ -0,0 +1,59 @@
+"""Connection pooling for SleepIQ API sessions."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import ssl
+
+from aiohttp import ClientSession, TCPConnector
+
+_ssl_context: ssl.SSLContext | None = None
+
+
+def shared_ssl_context() -> ssl.SSLContext:
+    """Return a default SSL context created once and shared by every connector."""
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = ssl.create_default_context()
+    return _ssl_context
+
+
+@dataclass
+class ConnectionOptions:
+    """Connection pool settings for a ClientSession.
+
+    Idle connections are kept open for keepalive_timeout seconds so polls
+    reuse them instead of doing a new TCP and TLS handshake, and DNS
+    lookups are cached for ttl_dns_cache seconds.
+    """
+
+    limit: int = 100  # 0 for no limit
+    limit_per_host: int = 0  # 0 for no limit
+    keepalive_timeout: float = 60.0
+    ttl_dns_cache: int | None = 300
+    ssl_context: ssl.SSLContext | None = None  # None to use shared_ssl_context()
+
+
+def create_connector(options: ConnectionOptions | None = None) -> TCPConnector:
+    """Create a connector that can be shared by sessions of many clients."""
+    options = options or ConnectionOptions()
+    return TCPConnector(
+        limit=options.limit,
+        limit_per_host=options.limit_per_host,
+        keepalive_timeout=options.keepalive_timeout,
+        ttl_dns_cache=options.ttl_dns_cache,
+        use_dns_cache=options.ttl_dns_cache is not None,
+        ssl=options.ssl_context or shared_ssl_context(),
+    )
+
+
+def create_client_session(
+    options: ConnectionOptions | None = None, connector: TCPConnector | None = None
+) -> ClientSession:
+    """Create a ClientSession with a tuned connection pool.
+
+    When connector is given the session uses it without owning it, so
+    closing the session leaves the connector open for the other clients.
+    """
+    if connector is not None:
+        return ClientSession(connector=connector, connector_owner=False)
+    return ClientSession(connector=create_connector(options))
@@ -0,0 +1,133 @@
+"""Local storage of sleep data for SleepIQ sleepers."""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import asyncio
+from dataclasses import asdict, fields
+import json
+import os
+import sqlite3
+from typing import Any
+
+from .sleeper import SleepData
+
+_SLEEP_DATA_FIELDS = {f.name for f in fields(SleepData)}
+
+
+class SleepDataStore(ABC):
+    """Base class for storing nights of sleep data by sleeper id and night (YYYY-MM-DD).
+
+    The watermark of a sleeper is the latest night sync_sleep_data stored.
+    """
+
+    @abstractmethod
+    async def get(self, sleeper_id: str, night: str) -> SleepData | None:
+        """Return stored sleep data of a night or None."""
+
+    @abstractmethod
+    async def get_range(self, sleeper_id: str, start: str, end: str) -> list[SleepData]:
+        """Return stored sleep data of the nights from start to end (inclusive) in date order."""
+
+    @abstractmethod
+    async def put(self, sleeper_id: str, nights: list[SleepData]) -> None:
+        """Store or replace sleep data of nights, which must have a date."""
+
+    @abstractmethod
+    async def watermark(self, sleeper_id: str) -> str | None:
+        """Return the latest synced night of a sleeper or None."""
+
+    @abstractmethod
+    async def set_watermark(self, sleeper_id: str, night: str) -> None:
+        """Set the latest synced night of a sleeper."""
+
+
+class SQLiteSleepDataStore(SleepDataStore):
+    """Sleep data store in a SQLite database file."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """Initialize SQLite sleep data store."""
+        self.path = os.fspath(path)
+        self._connection: sqlite3.Connection | None = None
+        self._lock = asyncio.Lock()
+
+    def __str__(self) -> str:
+        """Return string representation."""
+        return f"SQLiteSleepDataStore({self.path})"
+
+    __repr__ = __str__
+
+    async def get(self, sleeper_id: str, night: str) -> SleepData | None:
+        """Return stored sleep data of a night or None."""
+        rows = await self._execute(
+            "SELECT data FROM sleep_data WHERE sleeper_id = ? AND night = ?", (sleeper_id, night)
+        )
+        return _decode(rows[0][0]) if rows else None
+
+    async def get_range(self, sleeper_id: str, start: str, end: str) -> list[SleepData]:
+        """Return stored sleep data of the nights from start to end (inclusive) in date order."""
+        rows = await self._execute(
+            "SELECT data FROM sleep_data WHERE sleeper_id = ? AND night BETWEEN ? AND ? ORDER BY night",
+            (sleeper_id, start, end),
+        )
+        return [_decode(data) for data, in rows]
+
+    async def put(self, sleeper_id: str, nights: list[SleepData]) -> None:
+        """Store or replace sleep data of nights, which must have a date."""
+        await self._execute(
+            "INSERT OR REPLACE INTO sleep_data (sleeper_id, night, data) VALUES (?, ?, ?)",
+            [(sleeper_id, night.date, json.dumps(asdict(night))) for night in nights],
+            many=True,
+        )
+
+    async def watermark(self, sleeper_id: str) -> str | None:
+        """Return the latest synced night of a sleeper or None."""
+        rows = await self._execute("SELECT night FROM watermarks WHERE sleeper_id = ?", (sleeper_id,))
+        return rows[0][0] if rows else None
+
+    async def set_watermark(self, sleeper_id: str, night: str) -> None:
+        """Set the latest synced night of a sleeper."""
+        await self._execute(
+            "INSERT OR REPLACE INTO watermarks (sleeper_id, night) VALUES (?, ?)", (sleeper_id, night)
+        )
+
+    async def close(self) -> None:
+        """Close the database."""
+        async with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    async def _execute(self, sql: str, params: Any, many: bool = False) -> list[tuple[Any, ...]]:
+        """Run a statement in a worker thread and return its rows."""
+        def execute() -> list[tuple[Any, ...]]:
+            connection = self._connect()
+            with connection:
+                if many:
+                    connection.executemany(sql, params)
+                    return []
+                return connection.execute(sql, params).fetchall()
+
+        async with self._lock:
+            return await asyncio.get_running_loop().run_in_executor(None, execute)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return the open connection, creating the database if needed."""
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS sleep_data ("
+                    "sleeper_id TEXT NOT NULL, night TEXT NOT NULL, data TEXT NOT NULL, "
+                    "PRIMARY KEY (sleeper_id, night))"
+                )
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS watermarks (sleeper_id TEXT PRIMARY KEY, night TEXT NOT NULL)"
+                )
+            self._connection = connection
+        return self._connection
+
+
+def _decode(data: str) -> SleepData:
+    """Return SleepData from its stored JSON, ignoring fields it no longer has."""
+    values = json.loads(data)
+    return SleepData(**{k: v for k, v in values.items() if k in _SLEEP_DATA_FIELDS})
@@ -1,11 +1,31 @@
 """Sleeper representation for SleepIQ API."""
 from __future__ import annotations
 
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date, datetime, timedelta
+import logging
+from typing import Any
 
-from .api import SleepIQAPI
-from .consts import SIDES_FULL, SIDES_SHORT, Side
+from aiohttp import ClientResponse
+
+from .api import SleepIQAPI, gather_limited
+from .consts import (
+    HISTORY_CONCURRENCY,
+    SIDES_FULL,
+    SIDES_SHORT,
+    SLEEP_DATA_INTERVALS,
+    SLEEP_SYNC_INITIAL_DAYS,
+    SLEEP_SYNC_RECHECK_DAYS,
+    STREAM_CHUNK_SIZE,
+    Side,
+)
+from .debounce import CoalescingWriter
+from .slices import SleepDataStreamParser, SleepSlices
+
+_LOGGER = logging.getLogger("ASyncSleepIQ")
 
 
 @dataclass
@@ -38,6 +58,113 @@ class SleepData:
     out_of_bed: int | None = None         # Time spent out of bed
     fall_asleep_period: int | None = None # Time to fall asleep
 
+    # Night the data is for (YYYY-MM-DD), when the API reports it
+    date: str | None = None
+
+
+def _primary_session(sessions: list[dict[str, Any]]) -> dict[str, Any] | None:
+    """Return the primary (longest) of a night's sessions."""
+    for session in sessions:
+        if session.get("longest"):
+            return session
+    # Fallback: pick the session with the greatest totalSleepSessionTime
+    if sessions:
+        return max(sessions, key=lambda s: s.get("totalSleepSessionTime", 0))
+    return None
+
+
+def _apply_session(sleep_data: SleepData, session: dict[str, Any]) -> None:
+    """Set sleep data fields from a sleep session."""
+    # Timing
+    sleep_data.start_date = session.get("startDate")
+    sleep_data.end_date = session.get("endDate")
+
+    # Duration: use session-level inBed (time physically in bed, seconds).
+    # Note: the top-level aggregate field is inBedTotal/inBedAvg, not inBed,
+    # so data.get("inBed") always returns None — use the session field instead.
+    sleep_data.duration = session.get("inBed")
+
+    # Sleep quality
+    sleep_data.sleep_score = session.get("sleepQuotient")
+
+    # Vital signs
+    hr = session.get("avgHeartRate")
+    sleep_data.heart_rate = hr if hr and hr > 0 else None
+    sleep_data.respiratory_rate = session.get("avgRespirationRate")
+    sleep_data.hrv = session.get("hrv")
+
+    # Sleep breakdown
+    sleep_data.restful = session.get("restful")
+    sleep_data.restless = session.get("restless")
+    sleep_data.out_of_bed = session.get("outOfBed")
+    fap = session.get("fallAsleepPeriod")
+    sleep_data.fall_asleep_period = fap if fap and fap >= 0 else None
+
+
+def parse_sleep_data(data: dict[str, Any] | None) -> SleepData | None:
+    """Return sleep data for the primary session of a sleepData response."""
+    if not data:
+        return None
+
+    sleep_data = SleepData()
+
+    # Get duration - totalSleepSessionTime is always 0, use inBedTotal instead
+    sleep_data.duration = data.get("inBedTotal")
+
+    # Count total sessions across all days returned
+    days = data.get("sleepData", [])
+    all_sessions = []
+    for day in days:
+        all_sessions.extend(day.get("sessions", []))
+    sleep_data.session_count = len(all_sessions) or None
+    if days and days[-1].get("date"):
+        sleep_data.date = days[-1]["date"][:10]
+
+    primary_session = _primary_session(all_sessions)
+    if primary_session:
+        _apply_session(sleep_data, primary_session)
+    else:
+        # No session data — fall back to top-level aggregates
+        sleep_data.sleep_score = (
+            data.get("avgSleepIQ") or data.get("sleepIQAvg")
+        )
+        sleep_data.heart_rate = (
+            data.get("avgHeartRate") or data.get("heartRateAvg")
+        )
+        sleep_data.respiratory_rate = (
+            data.get("avgRespirationRate") or data.get("respirationRateAvg")
+        )
+        sleep_data.duration = data.get("inBedTotal") or data.get("inBedAvg")
+
+    return sleep_data
+
+
+def parse_sleep_night(day: dict[str, Any]) -> SleepData | None:
+    """Return sleep data for one night of a sleepData response, None without sessions."""
+    sessions = day.get("sessions", [])
+    primary_session = _primary_session(sessions)
+    if primary_session is None:
+        return None
+    sleep_data = SleepData(session_count=len(sessions), date=day.get("date", "")[:10] or None)
+    _apply_session(sleep_data, primary_session)
+    return sleep_data
+
+
+def _history_windows(start: date, end: date) -> deque[tuple[date, str]]:
+    """Return (end date, interval) of the sleepData requests covering start to end."""
+    windows: deque[tuple[date, str]] = deque()
+    while end >= start:
+        nights = (end - start).days + 1
+        # smallest interval covering the remaining nights, else the largest
+        interval = min(
+            SLEEP_DATA_INTERVALS,
+            key=lambda i: (SLEEP_DATA_INTERVALS[i] < nights, abs(SLEEP_DATA_INTERVALS[i] - nights)),
+        )
+        windows.append((end, interval))
+        end -= timedelta(days=SLEEP_DATA_INTERVALS[interval])
+    windows.reverse()
+    return windows
+
 
 class SleepIQSleeper:
     """Sleeper representation for SleepIQ API."""
@@ -58,6 +185,8 @@ class SleepIQSleeper:
         self.pressure = 0
         self.sleep_number = 0
         self.fav_sleep_number = 0
+        self.is_updating = False  # sleep number adjustment in progress
+        self._sleepnumber_writer = CoalescingWriter(self._send_sleepnumber)
 
         # Sleep health metrics
         self.sleep_data = SleepData()
@@ -78,11 +207,31 @@ class SleepIQSleeper:
         """Calibrate or "baseline" bed."""
         await self.api.put("sleeper/" + self.sleeper_id + "/calibrate")
 
+    @property
+    def debounce_window(self) -> float:
+        """Seconds set_sleepnumber calls are coalesced over, 0 sends every call."""
+        return self._sleepnumber_writer.window
+
+    @debounce_window.setter
+    def debounce_window(self, window: float) -> None:
+        self._sleepnumber_writer.window = window
+
     async def set_sleepnumber(self, setting: int) -> None:
-        """Set sleep number 5-100 (multiple of 5)."""
+        """Set sleep number 5-100 (multiple of 5).
+
+        With a debounce_window only the latest setting of a burst of calls
+        is sent, and each call returns once that command is acknowledged.
+        """
         if 0 > setting or setting > 100:
             raise ValueError("Invalid SleepNumber, must be between 0 and 100")
         setting = int(round(setting / 5)) * 5
+        if self.debounce_window > 0:
+            await self._sleepnumber_writer.write(setting)
+        else:
+            await self._send_sleepnumber(setting)
+
+    async def _send_sleepnumber(self, setting: int) -> None:
+        """Send a sleep number setting to the API."""
         data = {
             "sleepNumber": setting,
             "side": SIDES_SHORT[self.side],
@@ -123,6 +272,10 @@ class SleepIQSleeper:
             Field names vary (avgSleepIQ vs sleepIQAvg, etc.) and some fields like
             hrv may not be present in all responses.
         """
+        return parse_sleep_data(await self.__get_sleep_night(date))
+
+    async def __get_sleep_night(self, date: datetime) -> dict[str, Any] | None:
+        """Return the sleepData response for a single night."""
         date_str = date.strftime("%Y-%m-%dT%H:%M:%S")
 
         params = {
@@ -132,74 +285,141 @@ class SleepIQSleeper:
             "includeSlices": "false",
         }
 
+        return await self.api.get("sleepData", params=params)
+
+    async def get_sleep_history(
+        self, start: date, end: date, concurrency: int = HISTORY_CONCURRENCY
+    ) -> AsyncIterator[SleepData]:
+        """Yield sleep data for every night from start to end (inclusive) with data.
+
+        The range is fetched in windows of up to 30 nights per request
+        (intervals W1 and M1 are expected to end at the requested date), up
+        to concurrency windows at a time. If a response doesn't reach the
+        first or last night of its window, those nights are requested one
+        at a time instead. Nights are yielded in date order as soon as
+        their window arrives, so only the windows in flight are held in
+        memory however long the range is.
+        """
+        async for day in self.iter_sleep_days(start, end, concurrency):
+            sleep_data = parse_sleep_night(day)
+            if sleep_data:
+                yield sleep_data
+
+    async def iter_sleep_days(
+        self, start: date, end: date, concurrency: int = HISTORY_CONCURRENCY
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield the raw sleepData entry of every night from start to end, see get_sleep_history."""
+        start = start.date() if isinstance(start, datetime) else start
+        end = end.date() if isinstance(end, datetime) else end
+        windows = _history_windows(start, end)
+        pending: deque[tuple[date, date, asyncio.Task[Any]]] = deque()
+        last = ""
+        try:
+            while windows or pending:
+                while windows and len(pending) < concurrency:
+                    window_end, interval = windows.popleft()
+                    window_start = max(start, window_end - timedelta(days=SLEEP_DATA_INTERVALS[interval] - 1))
+                    task = asyncio.ensure_future(self.__fetch_days(window_end, interval))
+                    pending.append((window_start, window_end, task))
+                window_start, window_end, task = pending.popleft()
+                days = await task
+                days.extend(await self.__fetch_edge_gaps(days, window_start, window_end, concurrency))
+                for day in sorted(days, key=lambda day: day.get("date", "")):
+                    night = day.get("date", "")[:10]
+                    # skip nights outside the window or already yielded
+                    if night <= last or not window_start.isoformat() <= night <= window_end.isoformat():
+                        continue
+                    last = night
+                    yield day
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def __fetch_days(self, window_end: date, interval: str) -> list[dict[str, Any]]:
+        """Return the sleepData entries of the interval ending at window_end."""
+        params = {
+            "date": window_end.strftime("%Y-%m-%dT%H:%M:%S"),
+            "interval": interval,
+            "sleeper": self.sleeper_id,
+            "includeSlices": "false",
+        }
         data = await self.api.get("sleepData", params=params)
+        return list((data or {}).get("sleepData", []))
 
-        if not data:
-            return None
-
-        sleep_data = SleepData()
-
-        # Get duration - totalSleepSessionTime is always 0, use inBedTotal instead
-        sleep_data.duration = data.get("inBedTotal")
-
-        # Count total sessions across all days returned
-        all_sessions = []
-        for day in data.get("sleepData", []):
-            all_sessions.extend(day.get("sessions", []))
-        sleep_data.session_count = len(all_sessions) or None
-
-        # Find the primary (longest) session
-        primary_session = None
-        for session in all_sessions:
-            if session.get("longest"):
-                primary_session = session
-                break
-        # Fallback: pick the session with the greatest totalSleepSessionTime
-        if primary_session is None and all_sessions:
-            primary_session = max(
-                all_sessions,
-                key=lambda s: s.get("totalSleepSessionTime", 0),
-            )
+    async def __fetch_edge_gaps(
+        self, days: list[dict[str, Any]], window_start: date, window_end: date, concurrency: int
+    ) -> list[dict[str, Any]]:
+        """Return the nights missing from the start or end of a window's response, fetched with D1.
 
-        if primary_session:
-            # Timing
-            sleep_data.start_date = primary_session.get("startDate")
-            sleep_data.end_date = primary_session.get("endDate")
-
-            # Duration: use session-level inBed (time physically in bed, seconds).
-            # Note: the top-level aggregate field is inBedTotal/inBedAvg, not inBed,
-            # so data.get("inBed") always returns None — use the session field instead.
-            sleep_data.duration = primary_session.get("inBed")
-
-            # Sleep quality
-            sleep_data.sleep_score = primary_session.get("sleepQuotient")
-
-            # Vital signs
-            hr = primary_session.get("avgHeartRate")
-            sleep_data.heart_rate = hr if hr and hr > 0 else None
-            sleep_data.respiratory_rate = primary_session.get("avgRespirationRate")
-            sleep_data.hrv = primary_session.get("hrv")
-
-            # Sleep breakdown
-            sleep_data.restful = primary_session.get("restful")
-            sleep_data.restless = primary_session.get("restless")
-            sleep_data.out_of_bed = primary_session.get("outOfBed")
-            fap = primary_session.get("fallAsleepPeriod")
-            sleep_data.fall_asleep_period = fap if fap and fap >= 0 else None
-        else:
-            # No session data — fall back to top-level aggregates
-            sleep_data.sleep_score = (
-                data.get("avgSleepIQ") or data.get("sleepIQAvg")
-            )
-            sleep_data.heart_rate = (
-                data.get("avgHeartRate") or data.get("heartRateAvg")
-            )
-            sleep_data.respiratory_rate = (
-                data.get("avgRespirationRate") or data.get("respirationRateAvg")
+        A response that is anchored differently than expected (e.g. on a
+        calendar month) would otherwise drop those nights silently. Gaps
+        inside the window, or an empty response, are nights without data.
+        """
+        nights = sorted(night for night in (day.get("date", "")[:10] for day in days) if night)
+        if window_start == window_end or not nights:
+            return []
+        first, last = date.fromisoformat(nights[0]), date.fromisoformat(nights[-1])
+        missing = [window_start + timedelta(days=i) for i in range(max(0, (first - window_start).days))]
+        missing += [last + timedelta(days=i) for i in range(1, (window_end - last).days + 1)]
+        if not missing:
+            return []
+        results = await gather_limited(concurrency, *(self.__fetch_days(night, "D1") for night in missing))
+        found = [day for result in results for day in result]
+        if found:
+            _LOGGER.warning(
+                f"sleepData for {window_start}..{window_end} only covered {first}..{last}, "
+                f"fetched {len(missing)} nights one at a time"
             )
-            sleep_data.duration = data.get("inBedTotal") or data.get("inBedAvg")
+        return found
 
-        return sleep_data
+    async def get_sleep_slices(self, date: datetime, interval: str = "D1") -> AsyncIterator[SleepSlices]:
+        """Yield the per-minute slices of each night of an interval ending at date.
+
+        The response is parsed as it streams in and each night is yielded
+        once complete, so only about one night is held in memory however
+        many the interval has.
+        """
+        params = {
+            "date": date.strftime("%Y-%m-%dT%H:%M:%S"),
+            "interval": interval,
+            "sleeper": self.sleeper_id,
+            "includeSlices": "true",
+        }
+        nights: asyncio.Queue[SleepSlices] = asyncio.Queue(maxsize=1)
+        last = ""
+
+        async def put(days: list[dict[str, Any]]) -> None:
+            nonlocal last
+            for day in days:
+                # a retried request starts over, skip nights already queued
+                if day.get("date", "")[:10] > last:
+                    last = day["date"][:10]
+                    await nights.put(SleepSlices.from_day(day, parse_sleep_night(day)))
+
+        async def read(resp: ClientResponse) -> None:
+            parser = SleepDataStreamParser()
+            async for chunk in resp.content.iter_chunked(STREAM_CHUNK_SIZE):
+                await put(parser.feed(chunk))
+            await put(parser.close())
+
+        request = asyncio.ensure_future(self.api.read("sleepData", read, params))
+        night: asyncio.Future[SleepSlices] | None = None
+        try:
+            while True:
+                night = asyncio.ensure_future(nights.get())
+                await asyncio.wait((night, request), return_when=asyncio.FIRST_COMPLETED)
+                if night.done():
+                    yield night.result()
+                    continue
+                night.cancel()
+                while not nights.empty():
+                    yield nights.get_nowait()
+                request.result()
+                return
+        finally:
+            request.cancel()
+            if night:
+                night.cancel()
 
     async def fetch_sleep_data(self) -> None:
         """Fetch sleep data for the most recent night and store in sleeper.sleep_data.
@@ -220,13 +440,63 @@ class SleepIQSleeper:
             restless: Time spent restless (seconds)
             out_of_bed: Time spent out of bed (seconds)
             fall_asleep_period: Time to fall asleep (seconds)
+
+        With a sleep_store, a stored night whose session has ended is used
+        without a request. Otherwise the night is read from the API and
+        stored, parsed like sync_sleep_data does.
         """
         # Pass today's date — the API uses UTC internally, so "today" correctly
         # returns last night's completed sleep session. Passing "yesterday" causes
         # an off-by-one that returns data from 2 nights ago for UTC-offset users.
         last_night = datetime.now()
-        sleep_data = await self.get_sleep_data(last_night)
+        store = self.api.sleep_store
+        if store is not None:
+            stored = await store.get(self.sleeper_id, last_night.strftime("%Y-%m-%d"))
+            # a night stored while its session was in progress has no end date yet
+            if stored is not None and stored.end_date:
+                self.sleep_data = stored
+                return
+
+        data = await self.__get_sleep_night(last_night)
+        sleep_data = parse_sleep_data(data)
+        if store is not None and data:
+            nights = [parse_sleep_night(day) for day in data.get("sleepData", [])]
+            await store.put(self.sleeper_id, [night for night in nights if night and night.date])
 
         if sleep_data:
             self.sleep_data = sleep_data
 
+    async def sync_sleep_data(
+        self, start: date | None = None, recheck_days: int = SLEEP_SYNC_RECHECK_DAYS
+    ) -> int:
+        """Store nights up to today in the API's sleep_store and return how many were stored.
+
+        start defaults to recheck_days before the sleeper's watermark, so
+        late data for recent nights is picked up, or SLEEP_SYNC_INITIAL_DAYS
+        ago on the first sync. Pass an earlier start to backfill history.
+        """
+        store = self.api.sleep_store
+        if store is None:
+            raise ValueError("No sleep_store to sync to")
+        end = datetime.now().date()
+        if start is None:
+            watermark = await store.watermark(self.sleeper_id)
+            if watermark:
+                start = date.fromisoformat(watermark) - timedelta(days=recheck_days)
+            else:
+                start = end - timedelta(days=SLEEP_SYNC_INITIAL_DAYS - 1)
+
+        stored = 0
+        nights: list[SleepData] = []
+        async for night in self.get_sleep_history(start, end):
+            nights.append(night)
+            if len(nights) == SLEEP_DATA_INTERVALS["M1"]:
+                await store.put(self.sleeper_id, nights)
+                stored += len(nights)
+                nights = []
+        if nights:
+            await store.put(self.sleeper_id, nights)
+            stored += len(nights)
+        await store.set_watermark(self.sleeper_id, end.isoformat())
+        return stored
+
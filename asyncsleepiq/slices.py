@@ -0,0 +1,120 @@
+"""Streaming parser for per-minute sleep slices of the sleepData endpoint."""
+from __future__ import annotations
+
+from array import array
+import codecs
+from dataclasses import dataclass, field
+import json
+import re
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .sleeper import SleepData
+
+_SLEEP_DATA_ARRAY = re.compile(r'"sleepData"\s*:\s*\[')
+_WHITESPACE = " \t\r\n,"
+
+# sliceList keys and the SleepSlices buffers they're stored in
+SLICE_FIELDS = {
+    "type": "types",
+    "outOfBedTime": "out_of_bed",
+    "restfulTime": "restful",
+    "restlessTime": "restless",
+    "heartRate": "heart_rate",
+    "respirationRate": "respiration_rate",
+}
+
+
+@dataclass
+class SleepSlices:
+    """Per-minute slices of one night, each field a compact array with one value per slice.
+
+    Missing values are stored as 0.
+    """
+
+    date: str
+    sleep_data: SleepData | None = None  # summary of the night's primary session
+    types: array[int] = field(default_factory=lambda: array("b"))
+    out_of_bed: array[int] = field(default_factory=lambda: array("h"))  # seconds
+    restful: array[int] = field(default_factory=lambda: array("h"))     # seconds
+    restless: array[int] = field(default_factory=lambda: array("h"))    # seconds
+    heart_rate: array[int] = field(default_factory=lambda: array("h"))
+    respiration_rate: array[int] = field(default_factory=lambda: array("h"))
+
+    def __len__(self) -> int:
+        """Return number of slices."""
+        return len(self.types)
+
+    @classmethod
+    def from_day(cls, day: dict[str, Any], sleep_data: SleepData | None = None) -> SleepSlices:
+        """Move the sliceList of a sleepData day entry into a new SleepSlices."""
+        slices = cls(day.get("date", "")[:10], sleep_data)
+        buffers = [(key, getattr(slices, name)) for key, name in SLICE_FIELDS.items()]
+        for item in day.pop("sliceList", None) or []:
+            for key, buffer in buffers:
+                buffer.append(int(item.get(key) or 0))
+        return slices
+
+
+class SleepDataStreamParser:
+    """Incrementally parses the days of a sleepData response body.
+
+    Bytes are passed to feed() as they arrive and each day entry of the
+    sleepData array is returned as soon as it is complete, so only one
+    day is buffered at a time. Other top level fields are ignored.
+    """
+
+    def __init__(self) -> None:
+        """Initialize parser."""
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._in_array = False
+        self._done = False
+        # don't try to decode an incomplete day again until the buffer is this long
+        self._retry_at = 0
+
+    def feed(self, data: bytes) -> list[dict[str, Any]]:
+        """Add the next part of the body and return the days it completed."""
+        self._buffer += self._text.decode(data)
+        return self._parse(False)
+
+    def close(self) -> list[dict[str, Any]]:
+        """Finish the body and return any days left."""
+        self._buffer += self._text.decode(b"", final=True)
+        return self._parse(True)
+
+    def _parse(self, final: bool) -> list[dict[str, Any]]:
+        days: list[dict[str, Any]] = []
+        if self._done:
+            return days
+        if not self._in_array:
+            match = _SLEEP_DATA_ARRAY.search(self._buffer)
+            if not match:
+                return days
+            self._buffer = self._buffer[match.end():]
+            self._in_array = True
+        while True:
+            pos = 0
+            while pos < len(self._buffer) and self._buffer[pos] in _WHITESPACE:
+                pos += 1
+            self._buffer = self._buffer[pos:]
+            if not self._buffer:
+                return days
+            if self._buffer[0] == "]":
+                self._done = True
+                self._buffer = ""
+                return days
+            if not final and len(self._buffer) < self._retry_at:
+                return days
+            try:
+                day, end = self._decoder.raw_decode(self._buffer)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                # wait for the day to at least double before decoding it again
+                self._retry_at = 2 * len(self._buffer)
+                return days
+            self._buffer = self._buffer[end:]
+            self._retry_at = 0
+            days.append(day)
@@ -0,0 +1,109 @@
+"""Snapshot and restore of discovered bed topology."""
+from __future__ import annotations
+
+from typing import Any
+
+from .actuator import SleepIQActuator
+from .api import SleepIQAPI
+from .bed import SleepIQBed
+from .consts import SIDES_FULL, End, Side
+from .foot_warmer import SleepIQFootWarmer
+from .foundation import SleepIQFoundation
+from .fuzion.actuator import SleepIQFuzionActuator
+from .fuzion.bed import SleepIQFuzionBed
+from .fuzion.core_climate import SleepIQFuzionClimateCoolCoreClimate, SleepIQFuzionCoreClimate
+from .fuzion.foot_warmer import SleepIQFuzionFootWarmer
+from .fuzion.light import SleepIQFuzionLight
+from .fuzion.preset import SleepIQFuzionPreset
+from .light import SleepIQLight
+from .preset import SleepIQPreset
+
+TOPOLOGY_VERSION = 1
+
+CORE_CLIMATE_KINDS: dict[str, type[SleepIQFuzionCoreClimate]] = {
+    "heidi": SleepIQFuzionCoreClimate,
+    "climate_cool": SleepIQFuzionClimateCoolCoreClimate,
+}
+
+
+def foundation_to_dict(foundation: SleepIQFoundation) -> dict[str, Any] | None:
+    """Return the features and entities of a foundation, None if not discovered yet."""
+    if not foundation.initialized:
+        return None
+    return {
+        "type": foundation.type,
+        "features": foundation.features,
+        "lights": [light.outlet_id for light in foundation.lights],
+        "actuators": [[a.side.value, a.actuator.value] for a in foundation.actuators],
+        "presets": [[p.side.value, p.options] for p in foundation.presets],
+        "foot_warmers": [w.side.value for w in foundation.foot_warmers],
+        "core_climates": [
+            [c.side.value, next(k for k, cls in CORE_CLIMATE_KINDS.items() if type(c) is cls)]
+            for c in foundation.core_climates
+        ],
+    }
+
+
+def bed_to_dict(bed: SleepIQBed) -> dict[str, Any]:
+    """Return the hardware topology of a bed as JSON serializable data."""
+    return {
+        "bedId": bed.id,
+        "name": bed.name,
+        "macAddress": bed.mac_addr,
+        "model": bed.model,
+        "generation": "fuzion" if isinstance(bed, SleepIQFuzionBed) else "",
+        "sleepers": [[s.side.value, s.sleeper_id, s.name, s.active] for s in bed.sleepers],
+        "foundation": foundation_to_dict(bed.foundation),
+    }
+
+
+def bed_from_dict(api: SleepIQAPI, data: dict[str, Any]) -> SleepIQBed:
+    """Rebuild a bed and its sleepers and foundation from bed_to_dict data."""
+    bed_data = {k: data[k] for k in ("bedId", "name", "macAddress", "model", "generation")}
+    for side, sleeper_id, _, _ in data["sleepers"]:
+        bed_data[f"sleeper{SIDES_FULL[Side(side)]}Id"] = sleeper_id
+    fuzion = data["generation"] == "fuzion"
+    bed = SleepIQFuzionBed(api, bed_data) if fuzion else SleepIQBed(api, bed_data)
+
+    for sleeper, (_, _, name, active) in zip(bed.sleepers, data["sleepers"]):
+        sleeper.name = name
+        sleeper.active = active
+
+    fd = data["foundation"]
+    if fd is None:  # saved before a lazy foundation was discovered
+        return bed
+    foundation = bed.foundation
+    foundation.initialized = True
+    foundation.type = fd["type"]
+    foundation.features = dict(fd["features"])
+    light_cls = SleepIQFuzionLight if fuzion else SleepIQLight
+    foundation.lights = [light_cls(api, bed.id, outlet) for outlet in fd["lights"]]
+    actuator_cls = SleepIQFuzionActuator if fuzion else SleepIQActuator
+    foundation.actuators = [actuator_cls(api, bed.id, Side(side), End(end)) for side, end in fd["actuators"]]
+    if fuzion:
+        foundation.presets = [SleepIQFuzionPreset(api, bed.id, Side(side), options) for side, options in fd["presets"]]
+    else:
+        foundation.presets = [SleepIQPreset(api, bed.id, Side(side)) for side, _ in fd["presets"]]
+    warmer_cls = SleepIQFuzionFootWarmer if fuzion else SleepIQFootWarmer
+    foundation.foot_warmers = [warmer_cls(api, bed.id, Side(side), 0, 0) for side in fd["foot_warmers"]]
+    foundation.core_climates = [
+        CORE_CLIMATE_KINDS[kind](api, bed.id, Side(side), 0, 0) for side, kind in fd["core_climates"]
+    ]
+    return bed
+
+
+def dump_topology(account_id: str, beds: dict[str, SleepIQBed]) -> dict[str, Any]:
+    """Return the topology of an account's beds as JSON serializable data."""
+    return {
+        "version": TOPOLOGY_VERSION,
+        "accountId": account_id,
+        "beds": [bed_to_dict(bed) for bed in beds.values()],
+    }
+
+
+def load_topology(api: SleepIQAPI, data: dict[str, Any]) -> dict[str, SleepIQBed] | None:
+    """Rebuild beds from dump_topology data, None if it's from another version."""
+    if data.get("version") != TOPOLOGY_VERSION:
+        return None
+    beds = [bed_from_dict(api, bed_data) for bed_data in data["beds"]]
+    return {bed.id: bed for bed in beds}
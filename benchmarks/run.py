@@ -0,0 +1,170 @@
+"""Benchmark discovery, polling and command latency against the local emulator.
+
+Each configuration starts a SleepIQEmulator in a separate process with the
+given number of beds (half classic, half Fuzion) and simulated round trip
+time, then measures wall time, API request count and peak client memory of:
+
+    init_beds              full account discovery
+    fetch_bed_statuses     one occupancy poll of every bed
+    foundation_classic     update_foundation_status of one classic bed
+    foundation_fuzion      update_foundation_status of one Fuzion bed
+    get_sleep_data         one night of sleep data for one sleeper
+
+Usage:
+    python benchmarks/run.py --beds 1,10,100,1000 --rtt 0,50,200 --output bench_results.json
+    python benchmarks/run.py --compare old.json --output new.json
+
+With --compare, results slower or making more requests than the old file by
+more than --threshold are reported and the exit status is 1.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+import json
+import multiprocessing
+from multiprocessing.connection import Connection
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from asyncsleepiq import AsyncSleepIQ  # noqa: E402
+from asyncsleepiq.emulator import FaultConfig, SleepIQEmulator, fixed_latency  # noqa: E402
+from asyncsleepiq.fuzion.bed import SleepIQFuzionBed  # noqa: E402
+
+
+def serve(beds: int, rtt: float, conn: Connection) -> None:
+    """Run an emulator until told to stop, sending its URL over conn."""
+
+    async def main() -> None:
+        faults = FaultConfig(latency=fixed_latency(rtt) if rtt else None)
+        async with SleepIQEmulator(beds=beds - beds // 2, fuzion_beds=beds // 2, faults=faults) as emulator:
+            conn.send(emulator.url)
+            await asyncio.get_running_loop().run_in_executor(None, conn.recv)
+
+    asyncio.run(main())
+
+
+def request_count(api: AsyncSleepIQ) -> int:
+    """Return number of API requests made by api so far."""
+    return sum(histogram.count for histogram in api.instrumentation.histograms.values())
+
+
+async def measure(api: AsyncSleepIQ, run: Callable[[], Awaitable[Any]], repeat: int) -> dict[str, float]:
+    """Return mean wall time, requests and peak memory of run."""
+    requests = request_count(api)
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await run()
+    wall = (time.perf_counter() - start) / repeat
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "wall_s": round(wall, 6),
+        "requests": (request_count(api) - requests) / repeat,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+async def bench(url: str, repeat: int) -> dict[str, dict[str, float]]:
+    """Run every scenario against the emulator at url."""
+    api = AsyncSleepIQ("bench@example.com", "password", api_url=url)
+    try:
+        await api.login()
+        results = {"init_beds": await measure(api, api.init_beds, 1)}
+        results["fetch_bed_statuses"] = await measure(api, api.fetch_bed_statuses, repeat)
+
+        classic = next((b for b in api.beds.values() if not isinstance(b, SleepIQFuzionBed)), None)
+        fuzion = next((b for b in api.beds.values() if isinstance(b, SleepIQFuzionBed)), None)
+        for name, bed in (("foundation_classic", classic), ("foundation_fuzion", fuzion)):
+            if bed:
+                results[name] = await measure(api, bed.foundation.update_foundation_status, repeat)
+
+        sleeper = next(iter(api.beds.values())).sleepers[0]
+        results["get_sleep_data"] = await measure(api, lambda: sleeper.get_sleep_data(datetime.now()), repeat)
+        return results
+    finally:
+        await api.close_session()
+
+
+def run_config(beds: int, rtt_ms: float, repeat: int) -> list[dict[str, Any]]:
+    """Benchmark one bed count and round trip time."""
+    parent, child = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=serve, args=(beds, rtt_ms / 1000, child), daemon=True)
+    server.start()
+    try:
+        url = parent.recv()
+        results = asyncio.run(bench(url, repeat))
+    finally:
+        parent.send("stop")
+        server.join(10)
+    return [{"scenario": name, "beds": beds, "rtt_ms": rtt_ms, **values} for name, values in results.items()]
+
+
+def compare(old: list[dict[str, Any]], new: list[dict[str, Any]], threshold: float) -> list[str]:
+    """Return descriptions of results that regressed by more than threshold."""
+    previous = {(r["scenario"], r["beds"], r["rtt_ms"]): r for r in old}
+    regressions = []
+    for result in new:
+        before = previous.get((result["scenario"], result["beds"], result["rtt_ms"]))
+        if not before:
+            continue
+        for metric in ("wall_s", "requests"):
+            if before[metric] and result[metric] > before[metric] * (1 + threshold):
+                regressions.append(
+                    f"{result['scenario']} beds={result['beds']} rtt={result['rtt_ms']}ms "
+                    f"{metric}: {before[metric]} -> {result[metric]}"
+                )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--beds", default="1,10,100", help="comma separated bed counts")
+    parser.add_argument("--rtt", default="0,50", help="comma separated simulated round trip times (ms)")
+    parser.add_argument("--repeat", type=int, default=3, help="repetitions of the polling scenarios")
+    parser.add_argument("--output", default="bench_results.json", help="JSON results file")
+    parser.add_argument("--compare", help="previous JSON results file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative regression")
+    args = parser.parse_args()
+
+    results = []
+    for beds in [int(b) for b in args.beds.split(",")]:
+        for rtt in [float(r) for r in args.rtt.split(",")]:
+            for result in run_config(beds, rtt, args.repeat):
+                print(
+                    f"{result['scenario']:<20} beds={beds:<5} rtt={rtt:>5}ms "
+                    f"wall={result['wall_s']:.4f}s requests={result['requests']:g} peak={result['peak_kib']}KiB"
+                )
+                results.append(result)
+
+    with open(args.output, "w") as f:
+        json.dump(
+            {
+                "python": platform.python_version(),
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f)["results"], results, args.threshold)
+        for regression in regressions:
+            print("REGRESSION", regression)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -21,6 +21,9 @@ setup(
     install_requires=[
         'aiohttp;python_version>="3.7"',
     ],
+    extras_require={
+        "analytics": ["numpy"],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
     ],